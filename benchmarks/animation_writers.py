@@ -0,0 +1,155 @@
+"""Compare the F-Curve keyframe writer against the old frame_set/keyframe_insert path.
+
+Run inside Blender:
+    
+    blender -b --factory-startup --python benchmarks/animation_writers.py -- --lines 2000
+
+Both writers key identical lines (same spawn/exit positions and frames), the
+keyframes are compared point by point and the wall time of each path is printed.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import bpy
+from mathutils import Vector
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import speedlines  # noqa: E402
+
+
+def legacy_add_line_animation(obj, spawn_position, exit_position, start_frame, end_frame):
+    """The keyframe_insert based writer the add-on used before the F-Curve writer"""
+    obj.animation_data_clear()
+    
+    bpy.context.scene.frame_set(1)
+    obj.hide_viewport = True
+    obj.hide_render = True
+    obj.location = spawn_position
+    obj.keyframe_insert(data_path="hide_viewport")
+    obj.keyframe_insert(data_path="hide_render")
+    obj.keyframe_insert(data_path="location")
+    
+    bpy.context.scene.frame_set(start_frame)
+    obj.hide_viewport = False
+    obj.hide_render = False
+    obj.location = spawn_position
+    obj.keyframe_insert(data_path="hide_viewport")
+    obj.keyframe_insert(data_path="hide_render")
+    obj.keyframe_insert(data_path="location")
+    
+    bpy.context.scene.frame_set(end_frame)
+    obj.location = exit_position
+    obj.hide_viewport = False
+    obj.hide_render = False
+    obj.keyframe_insert(data_path="location")
+    obj.keyframe_insert(data_path="hide_viewport")
+    obj.keyframe_insert(data_path="hide_render")
+    
+    bpy.context.scene.frame_set(end_frame + 10)
+    obj.hide_viewport = True
+    obj.hide_render = True
+    obj.keyframe_insert(data_path="hide_viewport")
+    obj.keyframe_insert(data_path="hide_render")
+    
+    for fcurve in obj.animation_data.action.fcurves:
+        for keyframe in fcurve.keyframe_points:
+            if "location" in fcurve.data_path:
+                keyframe.interpolation = 'LINEAR'
+            else:
+                keyframe.interpolation = 'CONSTANT'
+
+
+def fast_add_line_animation(obj, spawn_position, exit_position, start_frame, end_frame):
+    """The add-on's F-Curve writer with the same key layout as the legacy path"""
+    obj.animation_data_clear()
+    speedlines.write_line_keyframes(
+        obj,
+        [(1, spawn_position), (start_frame, spawn_position), (end_frame, exit_position)],
+        [(1, True), (start_frame, False), (end_frame, False), (end_frame + 10, True)],
+    )
+
+
+def make_line_specs(count, seed):
+    """Random but reproducible spawn/exit positions and frames"""
+    rng = random.Random(seed)
+    specs = []
+    for _ in range(count):
+        spawn = Vector((rng.uniform(-20, -10), rng.uniform(-5, 5), rng.uniform(-2, 2)))
+        exit_ = spawn + Vector((30.0, 0.0, 0.0))
+        start = 1 + rng.randint(0, 800)
+        specs.append((spawn, exit_, start, start + 400))
+    return specs
+
+
+def make_objects(prefix, count):
+    """Create empty line objects linked to a scratch collection"""
+    collection = bpy.data.collections.new(prefix)
+    bpy.context.scene.collection.children.link(collection)
+    objects = []
+    for index in range(count):
+        obj = bpy.data.objects.new(f"{prefix}_{index}", None)
+        collection.objects.link(obj)
+        objects.append(obj)
+    return objects
+
+
+def time_writer(writer, objects, specs):
+    """Key all objects with a writer and return the elapsed wall time"""
+    start = time.perf_counter()
+    for obj, spec in zip(objects, specs):
+        writer(obj, *spec)
+    return time.perf_counter() - start
+
+
+def fcurve_snapshot(obj):
+    """Keyframes of an object as {(data_path, index): [(frame, value, interpolation), ...]}"""
+    snapshot = {}
+    for fcurve in obj.animation_data.action.fcurves:
+        snapshot[(fcurve.data_path, fcurve.array_index)] = [
+            (round(kp.co[0], 4), round(kp.co[1], 4), kp.interpolation)
+            for kp in fcurve.keyframe_points
+        ]
+    return snapshot
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=500, help="number of lines to key")
+    parser.add_argument("--seed", type=int, default=0, help="seed for line positions and frames")
+    args = parser.parse_args(argv)
+    
+    scene = bpy.context.scene
+    specs = make_line_specs(args.lines, args.seed)
+    
+    legacy_objects = make_objects("Legacy", args.lines)
+    fast_objects = make_objects("Fast", args.lines)
+    
+    frame_before = scene.frame_current
+    fast_time = time_writer(fast_add_line_animation, fast_objects, specs)
+    frame_unchanged = scene.frame_current == frame_before
+    legacy_time = time_writer(legacy_add_line_animation, legacy_objects, specs)
+    
+    mismatches = 0
+    for legacy_obj, fast_obj in zip(legacy_objects, fast_objects):
+        if fcurve_snapshot(legacy_obj) != fcurve_snapshot(fast_obj):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"Keyframe mismatch: {legacy_obj.name} vs {fast_obj.name}")
+    
+    print(f"Lines keyed:              {args.lines}")
+    print(f"keyframe_insert + frame_set: {legacy_time:.3f} s")
+    print(f"F-Curve foreach_set:         {fast_time:.3f} s")
+    print(f"Speedup:                     {legacy_time / max(fast_time, 1e-9):.1f}x")
+    print(f"Current frame untouched:     {frame_unchanged}")
+    print(f"Objects with mismatching keys: {mismatches}")
+    
+    if mismatches or not frame_unchanged:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
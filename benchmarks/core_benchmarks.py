@@ -0,0 +1,128 @@
+"""Benchmark the bpy-free line math in a plain Python process.
+
+Run without Blender:
+    
+    python benchmarks/core_benchmarks.py --counts 10000 100000 --workers 1 4 --output core.json
+
+Every pattern and line count is laid out and timed with calculate_lines, and
+merged geometry is placed for every line type, once per number of worker
+threads. Each case runs several times and the fastest run is reported, so
+the numbers are comparable between runs on the same machine.
+
+The multi-threaded results are compared against the single-threaded ones
+and the script exits with status 1 when any array differs.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+# The core module is imported on its own, the package __init__ needs Blender
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "speedlines"))
+import core as speedlines_core  # noqa: E402
+from core import SpeedLinesConfig  # noqa: E402
+
+
+LINE_TYPES = ('SIMPLE', 'TAPERED', 'TUBE')
+PATTERNS = ('PARALLEL', 'RADIAL', 'RANDOM')
+DEFAULT_COUNTS = (1000, 10000, 100000)
+
+
+def best_time(function, repeat):
+    """Fastest wall time of repeat calls, and the result of the last call"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def arrays_equal(first, second):
+    """Whether two tuples of arrays hold exactly the same values"""
+    return all(np.array_equal(a, b) for a, b in zip(first, second))
+
+
+def bench_lines(config, workers, repeat):
+    """Time the layout and timing of every line of a config"""
+    indices = np.arange(config.line_count)
+    return best_time(lambda: speedlines_core.calculate_lines(config, indices, workers), repeat)
+
+
+def bench_geometry(config, layout, workers, repeat):
+    """Time placing and merging the line geometry of a config for every line"""
+    geometry = speedlines_core.line_geometry(config)
+    return best_time(lambda: speedlines_core.merge_line_geometry(
+        geometry, layout.positions, layout.directions, workers), repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=DEFAULT_COUNTS, help="line counts to sweep")
+    parser.add_argument("--patterns", nargs="+", default=PATTERNS, choices=PATTERNS)
+    parser.add_argument("--line-types", nargs="+", default=LINE_TYPES, choices=LINE_TYPES)
+    parser.add_argument("--workers", type=int, nargs="+", default=(1, os.cpu_count() or 1),
+                        help="worker thread counts to run every case with")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case, the fastest counts")
+    parser.add_argument("--seed", type=int, default=0, help="line seed used for every run")
+    parser.add_argument("--output", help="JSON file for the results")
+    args = parser.parse_args()
+    
+    runs = []
+    mismatches = []
+    for count in sorted(args.counts):
+        for pattern in args.patterns:
+            config = SpeedLinesConfig(line_count=count, pattern=pattern, seed=args.seed)
+            reference = None
+            for workers in args.workers:
+                seconds, (layout, motion) = bench_lines(config, workers, args.repeat)
+                if reference is None:
+                    reference = layout + motion
+                elif not arrays_equal(reference, layout + motion):
+                    mismatches.append(f"lines {pattern}/{count} with {workers} workers")
+                runs.append({"case": "lines", "variant": pattern, "line_count": count,
+                             "workers": workers, "time": seconds})
+                print(f"lines    {pattern:10} {count:8} workers {workers:3}  {seconds * 1000:9.2f} ms  "
+                      f"{count / seconds / 1e6:7.2f} M lines/s")
+        
+        layout, _ = speedlines_core.calculate_lines(
+            SpeedLinesConfig(line_count=count, pattern='RANDOM', seed=args.seed), np.arange(count))
+        for line_type in args.line_types:
+            config = SpeedLinesConfig(line_count=count, line_type=line_type, seed=args.seed)
+            reference = None
+            for workers in args.workers:
+                seconds, (geometry, line_ids) = bench_geometry(config, layout, workers, args.repeat)
+                if reference is None:
+                    reference = geometry + (line_ids,)
+                elif not arrays_equal(reference, geometry + (line_ids,)):
+                    mismatches.append(f"geometry {line_type}/{count} with {workers} workers")
+                runs.append({"case": "geometry", "variant": line_type, "line_count": count,
+                             "workers": workers, "time": seconds})
+                print(f"geometry {line_type:10} {count:8} workers {workers:3}  {seconds * 1000:9.2f} ms  "
+                      f"{len(geometry.vertices) / seconds / 1e6:7.2f} M vertices/s")
+    
+    if args.output:
+        results = {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "runs": runs,
+        }
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"Wrote {len(runs)} runs to {args.output}")
+    
+    for mismatch in mismatches:
+        print(f"Mismatch: {mismatch}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""Benchmark speedlines.generate across line types, patterns and line counts.
+
+Run inside Blender, first once to record a baseline on the machine the
+comparisons will run on:
+    
+    blender -b --factory-startup --python benchmarks/run_benchmarks.py -- \
+        --output my_baseline.json
+
+then after a change, comparing against it:
+    
+    blender -b --factory-startup --python benchmarks/run_benchmarks.py -- \
+        --output results.json --baseline my_baseline.json
+
+Every combination of line type, pattern and line count is generated from an
+empty scene, each in its own Blender process so the peak resident memory of
+a run is not hidden by an earlier, larger one. Each run records the phase
+times of the generate operator's own profile, the peak resident memory and
+how much the generation added to it, the number of datablocks and keyframes
+created and the time the clear operator takes to remove them again.
+
+Results are written as JSON. Timings depend on the machine, so no baseline
+ships with the add-on. When a baseline file (the output of an earlier run) is
+given, runs that got slower or used more memory than the thresholds allow,
+or that created a different number of datablocks or keyframes, are listed and
+the script exits with status 1. A scaling exponent fitted over the line
+counts of each sweep flags quadratic behavior even without a baseline.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import bpy
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import speedlines  # noqa: E402
+
+
+LINE_TYPES = ('SIMPLE', 'TAPERED', 'TUBE')
+PATTERNS = ('PARALLEL', 'RADIAL', 'RANDOM')
+DEFAULT_COUNTS = (100, 250, 500, 1000, 2000)
+
+# Datablock collections counted after every run
+DATABLOCKS = ("objects", "meshes", "actions", "materials", "node_groups", "collections")
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far, or None where it can't be read"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def action_fcurves(action):
+    """All F-Curves of an action, for both legacy and layered actions"""
+    layers = getattr(action, "layers", None)
+    if layers:
+        for layer in layers:
+            for strip in layer.strips:
+                for channelbag in getattr(strip, "channelbags", ()):
+                    yield from channelbag.fcurves
+        return
+    yield from action.fcurves
+
+
+def count_datablocks():
+    """Number of datablocks of each counted type in the file"""
+    return {key: len(getattr(bpy.data, key)) for key in DATABLOCKS}
+
+
+def count_keyframes():
+    """Number of keyframes over all actions in the file"""
+    return sum(len(fcurve.keyframe_points)
+               for action in bpy.data.actions
+               for fcurve in action_fcurves(action))
+
+
+def configure(props, mode, line_type, pattern, count, seed, log_path):
+    """Set up the scene properties for one run, all other settings stay at their defaults"""
+    props.generation_mode = mode
+    props.line_type = line_type
+    props.pattern = pattern
+    props.line_count = count
+    props.seed = seed
+    props.replace_existing = True
+    props.incremental_updates = False
+    props.live_controller = False
+    # The operator times its own phases
+    props.profile_generation = True
+    props.profile_cprofile = False
+    props.profile_log_path = log_path
+
+
+def run_once(props, mode, line_type, pattern, count, seed):
+    """Generate and clear one configuration and return its measurements"""
+    with tempfile.TemporaryDirectory(prefix="speedlines_benchmark_") as directory:
+        configure(props, mode, line_type, pattern, count, seed, os.path.join(directory, "profile.jsonl"))
+        
+        rss_before = peak_rss_mb()
+        start = time.perf_counter()
+        result = bpy.ops.speedlines.generate()
+        total = time.perf_counter() - start
+    
+    profile = speedlines.last_profile or {"phases": {}}
+    phases = {name: phase["time"] for name, phase in profile["phases"].items()}
+    peak = peak_rss_mb()
+    
+    datablocks = count_datablocks()
+    keyframes = count_keyframes()
+    
+    start = time.perf_counter()
+    bpy.ops.speedlines.clear()
+    clear_time = time.perf_counter() - start
+    
+    return {
+        "mode": mode,
+        "line_type": line_type,
+        "pattern": pattern,
+        "line_count": count,
+        "ok": result == {'FINISHED'},
+        "total_time": total,
+        "phases": phases,
+        "clear_time": clear_time,
+        "peak_rss_mb": peak,
+        "generation_rss_mb": peak - rss_before if peak is not None else None,
+        "datablocks": datablocks,
+        "keyframes": keyframes,
+    }
+
+
+def run_isolated(case, timeout):
+    """Run one case in a fresh Blender process and return its measurements"""
+    with tempfile.TemporaryDirectory(prefix="speedlines_benchmark_") as directory:
+        result_path = os.path.join(directory, "run.json")
+        command = [bpy.app.binary_path, "-b", "--factory-startup", "--python-exit-code", "1",
+                   "--python", os.path.abspath(__file__),
+                   "--", "--case", json.dumps(case), "--result", result_path]
+        try:
+            completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+            output = completed.stdout + completed.stderr
+        except subprocess.TimeoutExpired:
+            output = f"timed out after {timeout} s"
+        if os.path.exists(result_path):
+            with open(result_path) as file:
+                return json.load(file)
+    
+    print(output[-2000:])
+    return dict(case, ok=False, total_time=0.0, phases={}, clear_time=0.0, peak_rss_mb=None,
+                generation_rss_mb=None, datablocks={}, keyframes=0)
+
+
+def run_case(case, result_path):
+    """Inside the per-case Blender process: run one case and write its measurements"""
+    if not hasattr(bpy.types.Scene, "speedlines_props"):
+        speedlines.register()
+    run = run_once(bpy.context.scene.speedlines_props, case["mode"], case["line_type"], case["pattern"],
+                   case["line_count"], case["seed"])
+    with open(result_path, "w") as file:
+        json.dump(run, file)
+
+
+def run_key(run):
+    """Identify a run by its configuration"""
+    return f"{run['mode']}/{run['line_type']}/{run['pattern']}/{run['line_count']}"
+
+
+def scaling_exponents(runs):
+    """Least-squares slope of log(time) over log(line count) for every sweep.
+    
+    About 1 means linear scaling, about 2 means quadratic.
+    """
+    sweeps = {}
+    for run in runs:
+        if run["ok"] and run["total_time"] > 0:
+            sweep = f"{run['mode']}/{run['line_type']}/{run['pattern']}"
+            sweeps.setdefault(sweep, []).append((math.log(run["line_count"]), math.log(run["total_time"])))
+    
+    exponents = {}
+    for sweep, points in sweeps.items():
+        if len({x for x, _ in points}) < 2:
+            continue
+        mean_x = sum(x for x, _ in points) / len(points)
+        mean_y = sum(y for _, y in points) / len(points)
+        covariance = sum((x - mean_x) * (y - mean_y) for x, y in points)
+        variance = sum((x - mean_x) ** 2 for x, _ in points)
+        exponents[sweep] = covariance / variance
+    return exponents
+
+
+def compare_with_baseline(results, baseline, time_threshold, memory_threshold, min_time):
+    """List every regression of the results against a baseline"""
+    regressions = []
+    baseline_runs = {run_key(run): run for run in baseline.get("runs", [])}
+    
+    for run in results["runs"]:
+        key = run_key(run)
+        old = baseline_runs.get(key)
+        if old is None:
+            continue
+        if old["ok"] and not run["ok"]:
+            regressions.append(f"{key}: generation failed")
+            continue
+        
+        # Very short runs are mostly noise
+        if old["total_time"] >= min_time and run["total_time"] > old["total_time"] * (1 + time_threshold):
+            regressions.append(f"{key}: total time {old['total_time']:.3f} s -> {run['total_time']:.3f} s")
+        for phase, old_time in old.get("phases", {}).items():
+            new_time = run["phases"].get(phase, 0.0)
+            if old_time >= min_time and new_time > old_time * (1 + time_threshold):
+                regressions.append(f"{key}: {phase} {old_time:.3f} s -> {new_time:.3f} s")
+        
+        if old.get("peak_rss_mb") and run.get("peak_rss_mb") and \
+                run["peak_rss_mb"] > old["peak_rss_mb"] * (1 + memory_threshold):
+            regressions.append(f"{key}: peak RSS {old['peak_rss_mb']:.0f} MB -> {run['peak_rss_mb']:.0f} MB")
+        if old.get("generation_rss_mb") and run.get("generation_rss_mb") is not None and \
+                run["generation_rss_mb"] > old["generation_rss_mb"] * (1 + memory_threshold):
+            regressions.append(f"{key}: generation RSS {old['generation_rss_mb']:.0f} MB -> "
+                               f"{run['generation_rss_mb']:.0f} MB")
+        
+        if run["datablocks"] != old["datablocks"]:
+            regressions.append(f"{key}: datablocks {old['datablocks']} -> {run['datablocks']}")
+        if run["keyframes"] != old["keyframes"]:
+            regressions.append(f"{key}: keyframes {old['keyframes']} -> {run['keyframes']}")
+    
+    for sweep, exponent in results["scaling"].items():
+        old_exponent = baseline.get("scaling", {}).get(sweep)
+        if old_exponent is not None and exponent > old_exponent + 0.3:
+            regressions.append(f"{sweep}: scaling exponent {old_exponent:.2f} -> {exponent:.2f}")
+    
+    return regressions
+
+
+def print_run(run):
+    """Print the measurements of one run"""
+    phases = ", ".join(f"{phase} {seconds:.3f}" for phase, seconds in sorted(run["phases"].items()))
+    memory = f"{run['peak_rss_mb']:.0f} MB" if run["peak_rss_mb"] is not None else "n/a"
+    if run.get("generation_rss_mb") is not None:
+        memory += f" (+{run['generation_rss_mb']:.0f})"
+    status = "" if run["ok"] else "  FAILED"
+    print(f"{run_key(run):40} {run['total_time']:8.3f} s  clear {run['clear_time']:6.3f} s  "
+          f"rss {memory:>15}  keys {run['keyframes']:8}{status}")
+    print(f"{'':40} {phases}")
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=DEFAULT_COUNTS, help="line counts to sweep")
+    parser.add_argument("--line-types", nargs="+", default=LINE_TYPES, choices=LINE_TYPES)
+    parser.add_argument("--patterns", nargs="+", default=PATTERNS, choices=PATTERNS)
+    parser.add_argument("--modes", nargs="+", default=('OBJECTS',),
+                        choices=('OBJECTS', 'GEOMETRY_NODES', 'MERGED'))
+    parser.add_argument("--seed", type=int, default=0, help="line seed used for every run")
+    parser.add_argument("--output", default="speedlines_benchmark.json", help="JSON file for the results")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--time-threshold", type=float, default=0.25,
+                        help="allowed relative slowdown before a run counts as a regression")
+    parser.add_argument("--memory-threshold", type=float, default=0.25,
+                        help="allowed relative peak RSS growth before a run counts as a regression")
+    parser.add_argument("--min-time", type=float, default=0.05,
+                        help="phases faster than this in the baseline are not compared (seconds)")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds before a run is killed")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    
+    if args.case:
+        run_case(json.loads(args.case), args.result)
+        return
+    
+    runs = []
+    for mode in args.modes:
+        for line_type in args.line_types:
+            for pattern in args.patterns:
+                for count in sorted(args.counts):
+                    case = {"mode": mode, "line_type": line_type, "pattern": pattern,
+                            "line_count": count, "seed": args.seed}
+                    run = run_isolated(case, args.timeout)
+                    print_run(run)
+                    runs.append(run)
+    
+    results = {
+        "blender": bpy.app.version_string,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "runs": runs,
+        "scaling": scaling_exponents(runs),
+    }
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"Wrote {len(runs)} runs to {args.output}")
+    
+    for sweep, exponent in sorted(results["scaling"].items()):
+        warning = "  <- superlinear" if exponent > 1.3 else ""
+        print(f"Scaling {sweep:30} {exponent:5.2f}{warning}")
+    
+    failed = [run_key(run) for run in runs if not run["ok"]]
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare_with_baseline(
+            results, baseline, args.time_threshold, args.memory_threshold, args.min_time)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if not regressions:
+            print(f"No regressions against {args.baseline}")
+    
+    if failed or regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3063 @@
+import bpy
+from bpy.app.handlers import persistent
+from mathutils import Vector
+import cProfile
+import hashlib
+import json
+import os
+import pstats
+import tempfile
+import time
+import zlib
+from contextlib import contextmanager, nullcontext
+from types import SimpleNamespace
+
+import numpy as np
+
+from .core import (
+    LINGER_FRAMES, LOD_LEVELS, LOD_TRIANGLES, STREAM_CULL_THIN, STREAM_VIEWPORT_DISPLAY, LineGeometry,
+    LineLayout, LineMotion, SpeedLinesConfig, apply_triangle_budget, base_lod_level, calculate_line_motion_batch, calculate_lines,
+    line_geometry, line_random, lines_in_window, lod_geometry, lod_levels,
+    loop_line_motion, merge_line_geometry, merge_lod_geometry, normalize_rows, place_line_vertices,
+    read_line_cache, repeat_loop_motion, retime_line_motion, retime_lines, segment_depths, segments_in_frustum,
+    subset_lines, write_line_cache,
+)
+
+bl_info = {
+    "name": "Animated Speed Lines Generator",
+    "author": "Assistant",
+    "version": (1, 2),
+    "blender": (2, 80, 0),
+    "location": "View3D > Sidebar > Speed Lines",
+    "description": "Generate animated 3D speed lines in a zone",
+    "category": "Mesh",
+}
+
+def worker_count(props):
+    """Number of threads to precompute lines on, 0 means one per core"""
+    return getattr(props, "worker_threads", 1) or os.cpu_count() or 1
+
+def frame_window(scene, props):
+    """First and last frame lines must be visible in to be created, or None for all lines"""
+    if props.frame_window == 'PREVIEW' and scene.use_preview_range:
+        return [scene.frame_preview_start, scene.frame_preview_end]
+    if props.frame_window != 'ALL':
+        return [scene.frame_start, scene.frame_end]
+    return None
+
+def camera_frustum_planes(camera, scene, depsgraph):
+    """The six planes of the camera's view frustum at the current frame, shape (6, 4).
+    
+    Normals point into the frustum and have unit length, so a point is
+    inside when its distance to every plane is positive.
+    """
+    camera = camera.evaluated_get(depsgraph)
+    render = scene.render
+    projection = camera.calc_matrix_camera(
+        depsgraph, x=render.resolution_x, y=render.resolution_y,
+        scale_x=render.pixel_aspect_x, scale_y=render.pixel_aspect_y)
+    matrix = np.array(projection @ camera.matrix_world.inverted())
+    planes = np.array((
+        matrix[3] + matrix[0], matrix[3] - matrix[0],   # Left, right
+        matrix[3] + matrix[1], matrix[3] - matrix[1],   # Bottom, top
+        matrix[3] + matrix[2], matrix[3] - matrix[2],   # Near, far
+    ))
+    return planes / np.linalg.norm(planes[:, :3], axis=1)[:, np.newaxis]
+
+def camera_focal_pixels(scene, camera):
+    """Pixels a world unit covers at depth one in a perspective camera, or at any depth in an orthographic one"""
+    render = scene.render
+    scale = render.resolution_percentage / 100
+    width = render.resolution_x * scale * render.pixel_aspect_x
+    height = render.resolution_y * scale * render.pixel_aspect_y
+    data = camera.data
+    fit = data.sensor_fit
+    if fit == 'AUTO':
+        fit = 'HORIZONTAL' if width >= height else 'VERTICAL'
+    pixels = width if fit == 'HORIZONTAL' else height
+    if data.type == 'ORTHO':
+        return pixels / data.ortho_scale
+    # Auto fit spreads the sensor width over the longer side
+    sensor = data.sensor_height if data.sensor_fit == 'VERTICAL' else data.sensor_width
+    return pixels * data.lens / sensor
+
+def projected_line_widths(scene, camera, motion, rows, width):
+    """Largest width in pixels each line gets in the camera at the current frame, along its whole path"""
+    pixels = camera_focal_pixels(scene, camera)
+    if camera.data.type == 'ORTHO':
+        return np.full(len(rows), width * pixels)
+    
+    # Cameras look down their local -Z axis
+    matrix = np.array(camera.matrix_world)
+    depths = segment_depths(matrix[:3, 3], -matrix[:3, 2],
+                            np.asarray(motion.spawn_positions)[rows], np.asarray(motion.exit_positions)[rows])
+    return width * pixels / depths
+
+def camera_is_animated(camera):
+    """Whether the camera or anything it is parented to may move or zoom over time"""
+    if camera.data.animation_data is not None:
+        return True
+    obj = camera
+    while obj is not None:
+        if obj.animation_data is not None or len(obj.constraints):
+            return True
+        obj = obj.parent
+    return False
+
+def lines_in_camera_view(scene, camera, motion, rows, margins, frames=None, step=1):
+    """Which of the lines come into the camera's view while they are visible.
+    
+    frames are the frames to test an animated camera on, every line is
+    tested along the path it travels between them. Without frames the
+    camera is taken as static and every line is tested along its whole path.
+    """
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    spawn = np.asarray(motion.spawn_positions, dtype=np.float64)[rows]
+    exit_ = np.asarray(motion.exit_positions, dtype=np.float64)[rows]
+    margins = np.asarray(margins, dtype=np.float64)[rows]
+    if frames is None:
+        return segments_in_frustum(camera_frustum_planes(camera, scene, depsgraph), spawn, exit_, margins)
+    
+    start_frames = np.asarray(motion.start_frames, dtype=np.float64)[rows]
+    end_frames = np.asarray(motion.end_frames, dtype=np.float64)[rows]
+    travel = np.maximum(end_frames - start_frames, 1.0)
+    
+    visible = np.zeros(len(rows), dtype=bool)
+    current_frame = scene.frame_current
+    try:
+        for frame in frames:
+            # The part of each path travelled in the frames around this sample
+            first, last = frame - step / 2, frame + step / 2
+            active = ~visible & (start_frames <= last) & (end_frames + LINGER_FRAMES > first)
+            if not np.any(active):
+                continue
+            scene.frame_set(frame)
+            planes = camera_frustum_planes(camera, scene, depsgraph)
+            
+            progress_first = np.clip((first - start_frames[active]) / travel[active], 0.0, 1.0)
+            progress_last = np.clip((last - start_frames[active]) / travel[active], 0.0, 1.0)
+            path = exit_[active] - spawn[active]
+            visible[active] = segments_in_frustum(
+                planes,
+                spawn[active] + path * progress_first[:, np.newaxis],
+                spawn[active] + path * progress_last[:, np.newaxis],
+                margins[active])
+    finally:
+        scene.frame_set(current_frame)
+    return visible
+
+def write_line_geometry(mesh, geometry):
+    """Write geometry arrays into a mesh with foreach_set"""
+    mesh.clear_geometry()
+    
+    mesh.vertices.add(len(geometry.vertices))
+    mesh.vertices.foreach_set("co", geometry.vertices.astype(np.float32).ravel())
+    
+    if len(geometry.edges):
+        mesh.edges.add(len(geometry.edges))
+        mesh.edges.foreach_set("vertices", geometry.edges.astype(np.int32).ravel())
+    
+    if len(geometry.face_sizes):
+        loop_starts = np.concatenate(((0,), np.cumsum(geometry.face_sizes)[:-1]))
+        mesh.loops.add(len(geometry.face_vertices))
+        mesh.loops.foreach_set("vertex_index", geometry.face_vertices.astype(np.int32))
+        mesh.polygons.add(len(geometry.face_sizes))
+        mesh.polygons.foreach_set("loop_start", loop_starts.astype(np.int32))
+        if bpy.app.version < (4, 0, 0):
+            # Face sizes are derived from the loop starts since Blender 4.0
+            mesh.polygons.foreach_set("loop_total", geometry.face_sizes.astype(np.int32))
+    
+    mesh.update(calc_edges=True)
+    return mesh
+
+def read_line_geometry(mesh):
+    """Read a line mesh back into geometry arrays"""
+    vertices = np.zeros(len(mesh.vertices) * 3)
+    mesh.vertices.foreach_get("co", vertices)
+    
+    face_sizes = np.zeros(len(mesh.polygons), dtype=np.int64)
+    mesh.polygons.foreach_get("loop_total", face_sizes)
+    face_vertices = np.zeros(len(mesh.loops), dtype=np.int64)
+    mesh.loops.foreach_get("vertex_index", face_vertices)
+    
+    # Edges of faces are derived again when the geometry is written
+    if len(face_sizes):
+        edges = np.zeros((0, 2), dtype=np.int64)
+    else:
+        edges = np.zeros(len(mesh.edges) * 2, dtype=np.int64)
+        mesh.edges.foreach_get("vertices", edges)
+    return LineGeometry(vertices.reshape(-1, 3), edges.reshape(-1, 2), face_sizes, face_vertices)
+
+class LineStream:
+    """Line state of a streaming generation, sorted by spawn frame.
+    
+    Lines spawn in order and all stay visible for about the same number
+    of frames, so the lines visible at a frame are one short run of the
+    sorted arrays, found with two binary searches.
+    """
+    
+    def __init__(self, geometry, positions, directions, start_frames, travel_frames, travel_distances,
+                 loop=None):
+        order = np.argsort(start_frames, kind="stable")
+        directions = normalize_rows(np.asarray(directions, dtype=np.float64)[order])
+        travel_vectors = directions * np.asarray(travel_distances, dtype=np.float64)[order, np.newaxis]
+        
+        self.geometry = geometry
+        self.directions = directions
+        self.travel_vectors = travel_vectors
+        self.spawn_positions = np.asarray(positions, dtype=np.float64)[order] - travel_vectors / 2
+        self.start_frames = np.asarray(start_frames, dtype=np.float64)[order]
+        self.travel_frames = np.maximum(np.asarray(travel_frames, dtype=np.float64)[order], 1.0)
+        self.visible_frames = self.travel_frames + LINGER_FRAMES
+        self.max_visible_frames = self.visible_frames.max() if len(order) else 0.0
+        
+        # (loop_start, period) when the lines repeat every period
+        self.loop = loop
+        
+        # Number of lines the stream mesh currently has topology for
+        self.written_lines = -1
+        # Stream rows the line_id attribute of the stream mesh was written for
+        self.written_rows = None
+    
+    def active_lines(self, frame):
+        """Rows of the lines visible at a frame"""
+        first = np.searchsorted(self.start_frames, frame - self.max_visible_frames, side='right')
+        last = np.searchsorted(self.start_frames, frame, side='right')
+        rows = np.arange(first, last)
+        return rows[self.start_frames[rows] + self.visible_frames[rows] > frame]
+    
+    def write(self, mesh, frame):
+        """Write the visible lines at a frame into the mesh, returns how many there are"""
+        if self.loop is None:
+            rows = self.active_lines(frame)
+        else:
+            # Lines of the first period, plus those still visible from the previous one
+            loop_start, period = self.loop
+            frame = loop_start + (frame - loop_start) % period
+            rows = self.active_lines(frame)
+            wrapped = self.active_lines(frame + period)
+            frame = np.concatenate((np.full(len(rows), frame), np.full(len(wrapped), frame + period)))
+            rows = np.concatenate((rows, wrapped))
+        progress = np.clip((frame - self.start_frames[rows]) / self.travel_frames[rows], 0.0, 1.0)
+        positions = self.spawn_positions[rows] + self.travel_vectors[rows] * progress[:, np.newaxis]
+        
+        if len(rows) == self.written_lines and len(mesh.vertices) == len(rows) * len(self.geometry.vertices):
+            # Same number of lines as last frame, only the vertices move
+            vertices = place_line_vertices(self.geometry, positions, self.directions[rows])
+            mesh.vertices.foreach_set("co", vertices.astype(np.float32).ravel())
+        else:
+            geometry, _ = merge_line_geometry(self.geometry, positions, self.directions[rows])
+            write_line_geometry(mesh, geometry)
+            self.written_lines = len(rows)
+            self.written_rows = None
+        
+        # The material varies every line by its id, which has to follow the line
+        if self.written_rows is None or not np.array_equal(rows, self.written_rows):
+            line_id = mesh.attributes.get("line_id") or mesh.attributes.new("line_id", 'INT', 'POINT')
+            line_id.data.foreach_set("value", np.repeat(rows, len(self.geometry.vertices)).astype(np.int32))
+            self.written_rows = rows
+        mesh.update()
+        return len(rows)
+
+# Line streams read from their state objects, by stream object name
+_line_streams = {}
+
+def load_line_stream(stream_obj):
+    """The line stream of a stream object, read from its state and template objects when needed"""
+    state_obj = bpy.data.objects.get(stream_obj.get("speedlines_stream_state", ""))
+    template_obj = bpy.data.objects.get(stream_obj.get("speedlines_stream_template", ""))
+    if state_obj is None or template_obj is None:
+        return None
+    
+    state = state_obj.data
+    key = (state.as_pointer(), len(state.vertices), template_obj.data.as_pointer())
+    stream = _line_streams.get(stream_obj.name)
+    if stream is None or stream.key != key:
+        positions = np.zeros(len(state.vertices) * 3)
+        state.vertices.foreach_get("co", positions)
+        stream = LineStream(
+            read_line_geometry(template_obj.data),
+            positions.reshape(-1, 3),
+            read_attribute(state, "flow_direction", "vector", 3),
+            read_attribute(state, "spawn_frame", "value"),
+            read_attribute(state, "travel_frames", "value"),
+            read_attribute(state, "travel_distance", "value"),
+            tuple(state_obj["speedlines_loop"]) if "speedlines_loop" in state_obj else None,
+        )
+        stream.key = key
+        _line_streams[stream_obj.name] = stream
+    return stream
+
+@persistent
+def speedlines_stream_update(scene, depsgraph=None):
+    """Write the lines visible at the new frame into the streaming mesh"""
+    stream_obj = scene.objects.get("SpeedLines_Stream")
+    if stream_obj is None or stream_obj.type != 'MESH':
+        return
+    stream = load_line_stream(stream_obj)
+    if stream is not None:
+        stream.write(stream_obj.data, scene.frame_current_final)
+
+# Custom property marking datablocks created by a speed lines generation
+GENERATED_TAG = "speedlines_generated"
+
+# bpy.data collections holding datablocks a generation can create
+GENERATED_DATA = ("collections", "objects", "meshes", "actions", "node_groups")
+
+def tag_generated(id_block):
+    """Mark a datablock as created by a speed lines generation"""
+    id_block[GENERATED_TAG] = True
+    return id_block
+
+def collect_generated_datablocks():
+    """All datablocks created by speed lines generations, grouped by bpy.data collection"""
+    found = {key: {} for key in GENERATED_DATA}
+    
+    def add(key, id_block):
+        found[key][id_block.as_pointer()] = id_block
+    
+    for key in GENERATED_DATA:
+        for id_block in getattr(bpy.data, key):
+            # Orphans named SpeedLine* were leaked by versions that did not tag datablocks
+            if id_block.get(GENERATED_TAG) or (id_block.users == 0 and id_block.name.startswith("SpeedLine")):
+                add(key, id_block)
+    
+    # Untagged lines from older versions, with the mesh and action only they use
+    if "SpeedLines" in bpy.data.collections:
+        add("collections", bpy.data.collections["SpeedLines"])
+        for obj in bpy.data.collections["SpeedLines"].objects:
+            add("objects", obj)
+            if obj.type == 'MESH' and obj.data.users == 1:
+                add("meshes", obj.data)
+            if obj.animation_data and obj.animation_data.action and obj.animation_data.action.users == 1:
+                add("actions", obj.animation_data.action)
+    
+    return {key: list(ids.values()) for key, ids in found.items()}
+
+def remove_generated_datablocks():
+    """Delete all generated datablocks in one batch, returning how many of each were removed"""
+    found = collect_generated_datablocks()
+    bpy.data.batch_remove([id_block for ids in found.values() for id_block in ids])
+    removed = {key: len(ids) for key, ids in found.items()}
+    # Line materials lose their last users with the removed meshes
+    removed["materials"] = remove_unused_line_materials()
+    return removed
+
+def viewport_hidden_collection(collection, create=True):
+    """Child collection of the lines only shown in renders, disabled in viewports so they are never evaluated there"""
+    hidden = next((child for child in collection.children if child.get("speedlines_viewport_hidden")), None)
+    if hidden is None and create:
+        hidden = tag_generated(bpy.data.collections.new("SpeedLines_ViewportHidden"))
+        hidden["speedlines_viewport_hidden"] = True
+        collection.children.link(hidden)
+        hidden.hide_viewport = True
+    return hidden
+
+def apply_viewport_display(collection, percentage, seed):
+    """Show a seeded share of the line objects in viewports and move the rest to the hidden child collection.
+    
+    Returns the number of lines shown in viewports.
+    """
+    lines = [obj for obj in collection.all_objects if "line_index" in obj]
+    if not lines or (percentage >= 100 and viewport_hidden_collection(collection, create=False) is None):
+        return len(lines)
+    
+    hidden = viewport_hidden_collection(collection)
+    chunks = line_chunks(collection)
+    # The same lines are shown for a percentage whenever it is set
+    shown = line_random(seed, [obj["line_index"] for obj in lines], STREAM_VIEWPORT_DISPLAY) < percentage / 100
+    for obj, show in zip(lines, shown):
+        # Streamed in lines go back to their chunk
+        home = chunks.get(obj.get("speedlines_chunk"), collection)
+        source, target = (hidden, home) if show else (home, hidden)
+        if obj.name in source.objects:
+            target.objects.link(obj)
+            source.objects.unlink(obj)
+    return int(np.count_nonzero(shown))
+
+def line_chunks(collection):
+    """Child collections of a streamed in generation, by chunk number"""
+    return {child["speedlines_chunk"]: child for child in collection.children if "speedlines_chunk" in child}
+
+def chunk_collections(collection, motion, rows, first_frame, chunk_frames):
+    """Split lines into child collections by the chunk of frames they spawn in.
+    
+    Returns the collection of every row. The chunks start out disabled in
+    viewports, show_line_chunks enables the ones around the current frame.
+    """
+    numbers = np.maximum((np.asarray(motion.start_frames)[rows] - first_frame) // chunk_frames, 0)
+    targets = np.empty(len(rows), dtype=object)
+    for number in np.unique(numbers):
+        chunk = tag_generated(bpy.data.collections.new(f"SpeedLines_Chunk_{int(number):03d}"))
+        chunk["speedlines_chunk"] = int(number)
+        collection.children.link(chunk)
+        chunk.hide_viewport = True
+        targets[numbers == number] = chunk
+    return targets
+
+def update_chunk_frames(collection, lines, state):
+    """Store the frames the lines of every chunk are visible in, read from the line state"""
+    chunks = line_chunks(collection)
+    if not chunks or not lines:
+        return
+    motion = line_state_motion(state)
+    rows = line_state_rows(state, lines)
+    numbers = np.array([obj.get("speedlines_chunk", -1) for obj in lines])
+    for number, chunk in chunks.items():
+        members = rows[numbers == number]
+        if len(members):
+            chunk["speedlines_chunk_frames"] = [int(motion.start_frames[members].min()),
+                                                int(motion.end_frames[members].max()) + LINGER_FRAMES]
+
+def show_line_chunks(collection, frame, lead):
+    """Enable in viewports only the chunks with lines visible from lead frames before a frame on.
+    
+    Returns the number of chunks enabled.
+    """
+    shown = 0
+    for chunk in line_chunks(collection).values():
+        first, last = chunk.get("speedlines_chunk_frames", (0, -1))
+        hide = not first - lead <= frame <= last
+        # Only touch chunks that change, every change re-evaluates the view layer
+        if chunk.hide_viewport != hide:
+            chunk.hide_viewport = hide
+        shown += not hide
+    return shown
+
+def update_viewport_display(props, context):
+    """Re-split the existing line objects when the viewport display percentage changes"""
+    collection = bpy.data.collections.get("SpeedLines")
+    if collection is not None:
+        apply_viewport_display(collection, props.viewport_display, props.seed)
+
+# Controller custom properties and the generation parameters they drive
+CONTROLLER_SETTINGS = ("speed_units_per_second", "animation_speed", "animation_duration",
+                       "cycle_length", "spawn_randomness")
+
+def controller_settings(control_obj):
+    """Generation parameters of the lines, with the controller's live values applied"""
+    settings = json.loads(control_obj["speedlines_fingerprint"])
+    applied = SimpleNamespace(**settings)
+    for key in CONTROLLER_SETTINGS:
+        if key in control_obj:
+            settings[key] = round(float(control_obj[key]), 6)
+    if "flow_direction_x" in control_obj:
+        settings["flow_direction"] = [round(float(control_obj[f"flow_direction_{axis}"]), 6)
+                                      for axis in "xyz"]
+    return SimpleNamespace(**settings), applied
+
+def read_attribute(mesh, name, key, width=1, dtype=np.float32):
+    """Read a mesh attribute into a NumPy array"""
+    values = np.zeros(len(mesh.vertices) * width, dtype=dtype)
+    mesh.attributes[name].data.foreach_get(key, values)
+    return values.reshape(-1, width) if width > 1 else values
+
+def write_attribute(mesh, name, key, values):
+    """Write a NumPy array into a mesh attribute"""
+    mesh.attributes[name].data.foreach_set(key, np.asarray(values, dtype=np.float32).ravel())
+
+def add_line_attributes(mesh, layout, motion, line_ids):
+    """Add the per-line data the procedural modes animate from as point attributes"""
+    travel_frames = motion.end_frames - motion.start_frames
+    travel_distances = np.linalg.norm(motion.exit_positions - motion.spawn_positions, axis=1)
+    attributes = (
+        ("flow_direction", 'FLOAT_VECTOR', "vector", normalize_rows(layout.directions)),
+        ("spawn_frame", 'FLOAT', "value", motion.start_frames),
+        ("travel_frames", 'FLOAT', "value", travel_frames),
+        ("travel_distance", 'FLOAT', "value", travel_distances),
+        ("spawn_delay", 'FLOAT', "value", layout.spawn_delays),
+        ("cycle_offset", 'FLOAT', "value", layout.cycle_offsets),
+    )
+    for name, data_type, key, values in attributes:
+        attribute = mesh.attributes.new(name, data_type, 'POINT')
+        attribute.data.foreach_set(key, values[line_ids].astype(np.float32).ravel())
+    mesh.update()
+
+# Per-line state stored as point attributes: (name, data type, foreach key, width)
+LINE_STATE_ATTRIBUTES = (
+    ("line_index", 'INT', "value", 1),
+    ("flow_direction", 'FLOAT_VECTOR', "vector", 3),
+    ("spawn_frame", 'FLOAT', "value", 1),
+    ("travel_frames", 'FLOAT', "value", 1),
+    ("travel_distance", 'FLOAT', "value", 1),
+    ("spawn_delay", 'FLOAT', "value", 1),
+    ("cycle_offset", 'FLOAT', "value", 1),
+)
+
+def line_state(layout, motion, indices):
+    """Per-line state arrays, by attribute name plus "position" for the base positions"""
+    return {
+        "position": np.asarray(layout.positions, dtype=np.float64),
+        "line_index": np.asarray(indices),
+        "flow_direction": normalize_rows(layout.directions),
+        "spawn_frame": np.asarray(motion.start_frames),
+        "travel_frames": np.asarray(motion.end_frames) - np.asarray(motion.start_frames),
+        "travel_distance": np.linalg.norm(np.asarray(motion.exit_positions) - motion.spawn_positions, axis=1),
+        "spawn_delay": np.asarray(layout.spawn_delays),
+        "cycle_offset": np.asarray(layout.cycle_offsets),
+    }
+
+def write_line_state(mesh, state):
+    """Store per-line state arrays in a mesh, one point per line at its base position"""
+    mesh.clear_geometry()
+    mesh.vertices.add(len(state["position"]))
+    mesh.vertices.foreach_set("co", np.asarray(state["position"], dtype=np.float32).ravel())
+    for name, data_type, key, width in LINE_STATE_ATTRIBUTES:
+        attribute = mesh.attributes.get(name) or mesh.attributes.new(name, data_type, 'POINT')
+        dtype = np.int32 if data_type == 'INT' else np.float32
+        attribute.data.foreach_set(key, np.asarray(state[name], dtype=dtype).ravel())
+    mesh.update()
+    return mesh
+
+def read_line_state(mesh):
+    """Per-line state arrays of a mesh written by write_line_state, each read in one call"""
+    positions = np.zeros(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", positions)
+    state = {"position": positions.reshape(-1, 3).astype(np.float64)}
+    for name, data_type, key, width in LINE_STATE_ATTRIBUTES:
+        if name in mesh.attributes:
+            dtype = np.int32 if data_type == 'INT' else np.float32
+            state[name] = read_attribute(mesh, name, key, width, dtype)
+    if "line_index" not in state:
+        state["line_index"] = np.arange(len(mesh.vertices), dtype=np.int32)
+    return state
+
+def line_state_motion(state):
+    """Spawn/exit positions and frames of every line in a state"""
+    half_paths = state["flow_direction"] * (state["travel_distance"] / 2)[:, np.newaxis]
+    start_frames = np.rint(state["spawn_frame"]).astype(np.int64)
+    return LineMotion(state["position"] - half_paths, state["position"] + half_paths,
+                      start_frames, start_frames + np.rint(state["travel_frames"]).astype(np.int64))
+
+def subset_line_state(state, rows):
+    """The state of only some of the lines"""
+    return {name: values[rows] for name, values in state.items()}
+
+def merge_line_states(*states):
+    """Join line states, sorted by line index"""
+    merged = {name: np.concatenate([state[name] for state in states]) for name in states[0]}
+    return subset_line_state(merged, np.argsort(merged["line_index"], kind="stable"))
+
+def build_line_points(mesh, layout, motion, indices=None):
+    """Fill a mesh with one point per line at its base position, carrying the line attributes"""
+    if indices is None:
+        indices = np.arange(len(layout.positions))
+    return write_line_state(mesh, line_state(layout, motion, indices))
+
+def find_line_state(collection):
+    """The hidden object holding the state of keyed line objects, or None"""
+    if collection is None:
+        return None
+    return next((obj for obj in collection.objects if obj.get("speedlines_line_state")), None)
+
+def line_state_rows(state, lines):
+    """Row of each line object in a state sorted by line index"""
+    return np.searchsorted(state["line_index"], [obj["line_index"] for obj in lines])
+
+def key_lines_from_state(lines, state, visibility_mode='HIDE', rotate=False):
+    """Rewrite the keyframes, and optionally the rotation, of line objects from their state"""
+    motion = line_state_motion(state)
+    rows = line_state_rows(state, lines)
+    x_axis = Vector((1, 0, 0))
+    for obj, row in zip(lines, rows):
+        direction = state["flow_direction"][row]
+        if rotate and np.any(direction):
+            obj.rotation_euler = x_axis.rotation_difference(Vector(direction)).to_euler()
+        key_line_motion(obj, motion.spawn_positions[row], motion.exit_positions[row],
+                        int(motion.start_frames[row]), int(motion.end_frames[row]), visibility_mode)
+
+def legacy_line_state(lines, settings):
+    """Line state of objects generated before it moved to a state object, from their properties"""
+    travel = int(settings.animation_duration / settings.animation_speed)
+    end_frames = np.zeros(len(lines))
+    for row, obj in enumerate(lines):
+        # The last location key sits on the exit frame
+        fcurve = ensure_fcurve(obj, obj.animation_data.action, "location", 0, "Object Transforms")
+        co = np.zeros(len(fcurve.keyframe_points) * 2, dtype=np.float32)
+        fcurve.keyframe_points.foreach_get("co", co)
+        end_frames[row] = co[-2]
+    
+    layout = LineLayout(
+        np.array([tuple(obj["base_position"]) for obj in lines], dtype=np.float64),
+        np.array([tuple(obj["flow_direction"]) for obj in lines], dtype=np.float64),
+        np.array([obj.get("cycle_offset", 0.5) for obj in lines]),
+        np.array([obj["spawn_delay"] for obj in lines]),
+    )
+    start_frames = np.rint(end_frames).astype(np.int64) - travel
+    motion = calculate_line_motion_batch(
+        settings, layout.positions, layout.directions, layout.spawn_delays,
+        random_spawn_delays=start_frames - 1 - layout.spawn_delays.astype(np.int64))
+    return line_state(layout, motion, [obj["line_index"] for obj in lines])
+
+def retime_keyed_lines(lines, state_obj, settings, applied):
+    """Retime the state of line objects to new controller settings and rewrite their keyframes"""
+    retime_procedural_lines(state_obj.data, settings, applied)
+    key_lines_from_state(lines, read_line_state(state_obj.data),
+                         getattr(settings, "visibility_mode", 'HIDE'),
+                         rotate=settings.flow_direction != applied.flow_direction)
+
+def hide_line_state(state_obj, collection):
+    """Mark an object as the line state of a generation and link it hidden"""
+    state_obj["speedlines_line_state"] = True
+    collection.objects.link(state_obj)
+    state_obj.hide_viewport = True
+    state_obj.hide_render = True
+    return state_obj
+
+def retime_procedural_lines(mesh, settings, applied):
+    """Rewrite the per-point line attributes of a procedural mesh for new controller settings"""
+    co = np.zeros(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    
+    positions, directions, spawn_delays, motion = retime_lines(
+        settings, applied,
+        co.reshape(-1, 3),
+        read_attribute(mesh, "flow_direction", "vector", 3),
+        np.rint(read_attribute(mesh, "spawn_frame", "value")).astype(np.int64),
+        read_attribute(mesh, "spawn_delay", "value"),
+        read_attribute(mesh, "cycle_offset", "value"))
+    
+    mesh.vertices.foreach_set("co", positions.astype(np.float32).ravel())
+    write_attribute(mesh, "flow_direction", "vector", directions)
+    write_attribute(mesh, "spawn_delay", "value", spawn_delays)
+    write_attribute(mesh, "spawn_frame", "value", motion.start_frames)
+    write_attribute(mesh, "travel_frames", "value", motion.end_frames - motion.start_frames)
+    write_attribute(mesh, "travel_distance", "value",
+                    np.linalg.norm(motion.exit_positions - motion.spawn_positions, axis=1))
+    mesh.update()
+
+def apply_controller_settings(control_obj):
+    """Retime every line to the controller's live values.
+    
+    Returns the number of lines updated, or None when the controller
+    already matches the lines. Raises ValueError for looping lines, which
+    can't be retimed.
+    """
+    if "speedlines_fingerprint" not in control_obj:
+        return None
+    settings, applied = controller_settings(control_obj)
+    if vars(settings) == vars(applied):
+        return None
+    
+    # Looping lines are timed to the scene range, they are regenerated instead
+    if getattr(applied, "loop_mode", False):
+        raise ValueError("Looping speed lines are timed to the scene range and can't be retimed, generate them again")
+    
+    collection = bpy.data.collections.get("SpeedLines")
+    objects = list(collection.all_objects) if collection is not None else []
+    
+    lines = sorted((obj for obj in objects if "line_index" in obj and obj.animation_data),
+                   key=lambda obj: obj["line_index"])
+    if lines:
+        state_obj = find_line_state(collection)
+        if state_obj is None:
+            state_obj = tag_generated(bpy.data.objects.new(
+                "SpeedLines_State", write_line_state(tag_generated(bpy.data.meshes.new("SpeedLines_State")),
+                                                     legacy_line_state(lines, applied))))
+            hide_line_state(state_obj, collection)
+        retime_keyed_lines(lines, state_obj, settings, applied)
+        update_chunk_frames(collection, lines, read_line_state(state_obj.data))
+        show_line_chunks(collection, bpy.context.scene.frame_current, getattr(settings, "chunk_frames", 0) // 2)
+    count = len(lines)
+    
+    for obj in objects:
+        if obj.get("speedlines_line_state"):
+            continue
+        if obj.type == 'MESH' and obj.get(GENERATED_TAG) and "spawn_frame" in obj.data.attributes:
+            retime_procedural_lines(obj.data, settings, applied)
+            if "line_id" in obj.data.attributes:
+                count += len(np.unique(read_attribute(obj.data, "line_id", "value", dtype=np.int32)))
+            else:
+                count += len(obj.data.vertices)
+    
+    # Streams are read again from their retimed state objects
+    _line_streams.clear()
+    
+    # The fingerprint now describes the retimed lines
+    control_obj["speedlines_fingerprint"] = json.dumps(vars(settings))
+    return count
+
+# Set while the depsgraph handler writes keyframes, so its own updates are ignored
+_retiming = False
+
+@persistent
+def speedlines_controller_update(scene, depsgraph):
+    """Retime the lines when the controller's live values are edited"""
+    global _retiming
+    props = getattr(scene, "speedlines_props", None)
+    if _retiming or props is None or not props.live_controller:
+        return
+    
+    for update in depsgraph.updates:
+        control_obj = getattr(update.id, "original", None)
+        if (isinstance(control_obj, bpy.types.Object) and
+                control_obj.name == "SpeedLines_Controller"):
+            _retiming = True
+            try:
+                if apply_controller_settings(control_obj) is not None:
+                    speedlines_stream_update(scene)
+            except ValueError as e:
+                print(f"Warning: {e}")
+            finally:
+                _retiming = False
+            break
+
+# Generation parameters grouped by the part of an existing generation they affect.
+# Parameters outside these groups (layout, pattern, mode...) need a full rebuild.
+INCREMENTAL_GROUPS = {
+    "material": {"line_color", "emission_strength", "use_transparency",
+                 "color_variation", "brightness_variation", "opacity_variation"},
+    "controller": {"speed_units_per_second", "cycle_length"},
+    "motion": {"animation_duration", "animation_speed", "spawn_randomness", "line_length"},
+    "geometry": {"line_type", "line_length", "line_width", "taper_factor", "share_geometry"},
+    "count": {"line_count"},
+}
+
+# Settings that only change how the add-on behaves, not what it generates
+UI_PARAMETERS = {"replace_existing", "incremental_updates", "live_controller", "worker_threads",
+                 "viewport_display", "profile_generation", "profile_cprofile", "profile_log_path",
+                 "use_line_cache", "cache_directory"}
+
+def lod_mode(fingerprint):
+    """Whether the generation mode picks levels of detail and applies the triangle budget"""
+    return fingerprint["generation_mode"] in ('OBJECTS', 'MERGED')
+
+# Settings that have no effect on the generated lines while the test holds,
+# they are left at their defaults in the fingerprint so changing them doesn't
+# force a rebuild. spacing and length_variation are not read by the generator.
+INACTIVE_PARAMETERS = {
+    "chunk_frames": lambda fingerprint: fingerprint["frame_window"] != 'CHUNK',
+    "cull_keep_ratio": lambda fingerprint: fingerprint["camera_culling"] != 'THIN',
+    "cull_margin": lambda fingerprint: fingerprint["camera_culling"] == 'OFF',
+    "culling_step": lambda fingerprint: fingerprint["camera_culling"] == 'OFF',
+    "visibility_mode": lambda fingerprint: fingerprint["generation_mode"] != 'OBJECTS',
+    "use_lod": lambda fingerprint: fingerprint["line_type"] != 'TUBE' or not lod_mode(fingerprint),
+    "lod_bias": lambda fingerprint: (not fingerprint["use_lod"] or fingerprint["line_type"] != 'TUBE'
+                                     or not lod_mode(fingerprint)),
+    "triangle_budget": lambda fingerprint: not lod_mode(fingerprint),
+    "taper_factor": lambda fingerprint: fingerprint["line_type"] == 'SIMPLE',
+    "min_distance": lambda fingerprint: fingerprint["pattern"] != 'RADIAL',
+    "spacing": lambda fingerprint: True,
+    "length_variation": lambda fingerprint: True,
+}
+
+def fingerprint_value(value):
+    """A property value as a plain JSON-compatible value"""
+    if isinstance(value, float):
+        return round(value, 6)
+    if not isinstance(value, (str, bool, int)):
+        return [round(component, 6) for component in value]
+    return value
+
+def generation_fingerprint(props):
+    """The generation parameters as plain JSON-compatible values, inactive ones at their defaults"""
+    fingerprint = {}
+    for prop in props.bl_rna.properties:
+        key = prop.identifier
+        if key in ("rna_type", "name") or key in UI_PARAMETERS:
+            continue
+        fingerprint[key] = fingerprint_value(getattr(props, key))
+    
+    inactive = [key for key, test in INACTIVE_PARAMETERS.items() if key in fingerprint and test(fingerprint)]
+    for key in inactive:
+        fingerprint[key] = fingerprint_value(props.bl_rna.properties[key].default)
+    return fingerprint
+
+def plan_incremental_update(old_fingerprint, new_fingerprint):
+    """Groups of an existing generation to update, or None when it has to be rebuilt"""
+    changed = {key for key, value in new_fingerprint.items() if old_fingerprint.get(key) != value}
+    changed |= set(old_fingerprint) - set(new_fingerprint)
+    
+    updates = {group for group, parameters in INCREMENTAL_GROUPS.items() if changed & parameters}
+    if changed - set().union(*INCREMENTAL_GROUPS.values()):
+        return None
+    
+    if new_fingerprint["generation_mode"] != 'OBJECTS':
+        # The procedural modes are rebuilt in one fast pass anyway
+        return updates if updates <= {"material", "controller"} else None
+    
+    # Lines outside the frame window were never created, so only their looks can change
+    if new_fingerprint.get("frame_window", 'ALL') != 'ALL':
+        return updates if updates <= {"material", "controller"} else None
+    
+    # Loop timing depends on the scene range, which is not part of the fingerprint
+    if new_fingerprint.get("loop_mode"):
+        return updates if updates and updates <= {"material", "controller"} else None
+    
+    # Culling and level of detail depend on the camera, which may have moved since,
+    # so rebuild on every generate that doesn't only change the looks
+    if (new_fingerprint.get("camera_culling", 'OFF') != 'OFF' or new_fingerprint.get("use_lod")
+            or new_fingerprint.get("triangle_budget")):
+        return updates if updates and updates <= {"material", "controller"} else None
+    
+    # Lines of the other patterns are laid out relative to the line count
+    if "count" in updates and new_fingerprint["pattern"] != 'RANDOM':
+        return None
+    
+    # Lines only share one mesh that can be swapped when share_geometry is on
+    if "geometry" in updates and not new_fingerprint["share_geometry"]:
+        return None
+    
+    return updates
+
+class GenerationProfile:
+    """Wall time of each generation phase, summed over all lines"""
+    
+    def __init__(self, use_cprofile=False):
+        self.totals = {}
+        self.calls = {}
+        self.wall_time = 0.0
+        self.profiler = cProfile.Profile() if use_cprofile else None
+    
+    @contextmanager
+    def phase(self, name):
+        """Add the time spent in the with block to a phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.totals[name] = self.totals.get(name, 0.0) + time.perf_counter() - start
+            self.calls[name] = self.calls.get(name, 0) + 1
+    
+    @contextmanager
+    def capture(self):
+        """Count the with block as generation time, and run cProfile over it if enabled"""
+        start = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.enable()
+        try:
+            yield
+        finally:
+            if self.profiler is not None:
+                self.profiler.disable()
+            self.wall_time += time.perf_counter() - start
+    
+    def phases(self):
+        """Phases sorted by time, with the time outside all phases as 'other'"""
+        phases = sorted(self.totals.items(), key=lambda item: item[1], reverse=True)
+        other = self.wall_time - sum(self.totals.values())
+        if other > 0.0005:
+            phases.append(("other", other))
+        return phases
+    
+    def summary(self):
+        """One-line summary for the operator report"""
+        wall_time = max(self.wall_time, 1e-9)
+        parts = ", ".join(f"{name} {seconds:.2f}s ({100 * seconds / wall_time:.0f}%)"
+                          for name, seconds in self.phases())
+        return f"{self.wall_time:.2f}s total: {parts}"
+    
+    def top_functions(self, limit=25):
+        """The functions with the highest cumulative time seen by cProfile"""
+        if self.profiler is None:
+            return []
+        stats = pstats.Stats(self.profiler).stats
+        rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+        return [{"function": f"{filename}:{line}({function})", "calls": calls,
+                 "total_time": total_time, "cumulative_time": cumulative_time}
+                for (filename, line, function), (_, calls, total_time, cumulative_time, _) in rows]
+    
+    def record(self, props):
+        """Everything measured as a JSON-compatible dict"""
+        return {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "blender": bpy.app.version_string,
+            "line_count": props.line_count,
+            "generation_mode": props.generation_mode,
+            "wall_time": self.wall_time,
+            "phases": {name: {"time": seconds, "calls": self.calls.get(name, 0)}
+                       for name, seconds in self.phases()},
+            "top_functions": self.top_functions(),
+            "parameters": generation_fingerprint(props),
+        }
+
+class NullProfile:
+    """Stand-in while profiling is off, every phase is a shared no-op context"""
+    
+    _noop = nullcontext()
+    
+    def phase(self, name):
+        return self._noop
+    
+    def capture(self):
+        return self._noop
+
+NULL_PROFILE = NullProfile()
+
+# Record of the last profiled generation, shown in the panel
+last_profile = None
+
+def blend_relative_path(path):
+    """Absolute path of a blend-relative path, in the temp directory for unsaved files"""
+    if path.startswith("//") and not bpy.data.filepath:
+        return os.path.join(bpy.app.tempdir or tempfile.gettempdir(), path[2:])
+    return bpy.path.abspath(path)
+
+def profile_log_path(props):
+    """Absolute path of the profiling log"""
+    return blend_relative_path(props.profile_log_path or "//speedlines_profile.jsonl")
+
+def write_profile_log(profile, props):
+    """Append a profile record to the JSON lines log, next to a .prof file for cProfile"""
+    path = profile_log_path(props)
+    record = profile.record(props)
+    with open(path, "a") as log:
+        log.write(json.dumps(record) + "\n")
+    if profile.profiler is not None:
+        profile.profiler.dump_stats(os.path.splitext(path)[0] + ".prof")
+    return record
+
+# The only parameters calculate_lines reads, every other setting only changes
+# which lines get created or how they look and can reuse the same cache
+CACHE_PARAMETERS = ("zone_center", "zone_size", "line_count", "line_length", "pattern", "min_distance",
+                    "randomness", "seed", "flow_direction", "animation_speed", "animation_duration",
+                    "spawn_randomness")
+
+# (text, icon) describing the last bake or cache lookup, shown in the cache panel
+line_cache_status = None
+
+def line_cache_key(props):
+    """Hash of the parameters that line layout and timing depend on"""
+    fingerprint = generation_fingerprint(props)
+    parameters = {key: fingerprint[key] for key in CACHE_PARAMETERS}
+    return hashlib.sha1(json.dumps(parameters, sort_keys=True).encode()).hexdigest()[:16]
+
+def line_cache_path(props, key=None):
+    """Path of the cache file for the current parameters"""
+    directory = blend_relative_path(props.cache_directory or "//speedlines_cache/")
+    return os.path.join(directory, f"speedlines_{key or line_cache_key(props)}.slc")
+
+def load_cached_lines(props):
+    """Layout and motion of the lines from a matching cache file, or None"""
+    global line_cache_status
+    key = line_cache_key(props)
+    path = line_cache_path(props, key)
+    line_cache_status = ("No cache matched the last generation", 'INFO')
+    if not os.path.exists(path):
+        return None
+    try:
+        header, arrays = read_line_cache(path, key)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not read speed line cache {path}: {e}")
+        return None
+    if header.get("line_count") != props.line_count:
+        return None
+    line_cache_status = (f"Last generation read {os.path.basename(path)}", 'CHECKMARK')
+    layout = LineLayout(*(arrays[name] for name in LineLayout._fields))
+    motion = LineMotion(*(arrays[name] for name in LineMotion._fields))
+    return layout, motion
+
+def bake_line_cache(props):
+    """Compute the lines for the current parameters and write them to their cache file"""
+    global line_cache_status
+    config = SpeedLinesConfig.from_properties(props)
+    layout, motion = calculate_lines(config, np.arange(props.line_count), worker_count(props))
+    
+    arrays = dict(zip(LineLayout._fields, layout))
+    arrays.update(zip(LineMotion._fields, motion))
+    key = line_cache_key(props)
+    header = {"key": key, "line_count": props.line_count, "parameters": generation_fingerprint(props)}
+    path = line_cache_path(props, key)
+    write_line_cache(path, header, arrays)
+    line_cache_status = (f"Baked {os.path.basename(path)}", 'CHECKMARK')
+    return path
+
+# Keyframe interpolation values as stored in F-Curve keyframe arrays
+KEYFRAME_CONSTANT = 0
+KEYFRAME_LINEAR = 1
+
+def ensure_fcurve(obj, action, data_path, index=0, group=""):
+    """Get or create an F-Curve on the object's action"""
+    if hasattr(action, "fcurve_ensure_for_datablock"):
+        # Layered actions (Blender 4.4+)
+        return action.fcurve_ensure_for_datablock(obj, data_path, index=index, group_name=group)
+    fcurve = action.fcurves.find(data_path, index=index)
+    if fcurve is None:
+        fcurve = action.fcurves.new(data_path, index=index, action_group=group)
+    return fcurve
+
+def fill_fcurve(fcurve, frames, values, interpolation):
+    """Write all keyframes of an F-Curve in bulk"""
+    count = len(frames)
+    points = fcurve.keyframe_points
+    if len(points) != count:
+        points.clear()
+        points.add(count)
+    
+    co = [0.0] * (count * 2)
+    co[0::2] = frames
+    co[1::2] = values
+    points.foreach_set("co", co)
+    points.foreach_set("handle_left", co)
+    points.foreach_set("handle_right", co)
+    points.foreach_set("interpolation", [interpolation] * count)
+    fcurve.update()
+
+def merge_keys(keys):
+    """Sort keys by frame, later keys on the same frame win (like keyframe_insert)"""
+    merged = {}
+    for frame, value in keys:
+        merged[float(frame)] = value
+    frames = sorted(merged)
+    return frames, [merged[frame] for frame in frames]
+
+def write_line_keyframes(obj, location_keys, hide_keys, visibility_mode='HIDE', cyclic=False):
+    """Write location and visibility keyframes straight into F-Curves.
+    
+    Unlike keyframe_insert this never touches the current frame, so the
+    cost per line does not grow with the number of objects in the scene.
+    visibility_mode 'HIDE' keys hide_viewport/hide_render, 'SCALE' keys the
+    scale to zero while hidden and 'SHADER' writes no visibility keys.
+    cyclic repeats the keys with a Cycles modifier on every F-Curve.
+    """
+    anim_data = obj.animation_data_create()
+    action = anim_data.action
+    if action is None:
+        action = tag_generated(bpy.data.actions.new(name=f"{obj.name}Action"))
+        anim_data.action = action
+    
+    fcurves = []
+    frames, locations = merge_keys(location_keys)
+    for axis in range(3):
+        fcurve = ensure_fcurve(obj, action, "location", axis, "Object Transforms")
+        fill_fcurve(fcurve, frames, [loc[axis] for loc in locations], KEYFRAME_LINEAR)
+        fcurves.append(fcurve)
+    
+    frames, hidden = merge_keys(hide_keys)
+    if visibility_mode == 'SCALE':
+        scales = [0.0 if value else 1.0 for value in hidden]
+        for axis in range(3):
+            fcurve = ensure_fcurve(obj, action, "scale", axis, "Object Transforms")
+            fill_fcurve(fcurve, frames, scales, KEYFRAME_CONSTANT)
+            fcurves.append(fcurve)
+    elif visibility_mode == 'HIDE':
+        hidden = [float(value) for value in hidden]
+        for data_path in ("hide_viewport", "hide_render"):
+            fcurve = ensure_fcurve(obj, action, data_path)
+            fill_fcurve(fcurve, frames, hidden, KEYFRAME_CONSTANT)
+            fcurves.append(fcurve)
+    
+    if cyclic:
+        for fcurve in fcurves:
+            if not any(modifier.type == 'CYCLES' for modifier in fcurve.modifiers):
+                fcurve.modifiers.new('CYCLES')
+    
+    return action
+
+def key_line_motion(obj, spawn_position, exit_position, start_frame, end_frame, visibility_mode='HIDE'):
+    """Key a line hidden before spawning, travelling from spawn to exit, then hidden again"""
+    hide_frame = end_frame + LINGER_FRAMES
+    write_line_keyframes(
+        obj,
+        [(1, spawn_position), (start_frame, spawn_position), (end_frame, exit_position)],
+        [(1, True), (start_frame, False), (end_frame, False), (hide_frame, True)],
+        visibility_mode,
+    )
+    if visibility_mode == 'SHADER':
+        # Read by the visibility nodes of the line material
+        obj["speedlines_spawn_frame"] = float(start_frame)
+        obj["speedlines_hide_frame"] = float(hide_frame)
+
+def key_line_loop(obj, spawn_position, exit_position, start_frame, end_frame, loop,
+                  visibility_mode='HIDE'):
+    """Key one loop period of a line and repeat it with Cycles modifiers.
+    
+    The keys start and end on the loop boundaries with the same values, so
+    lines still travelling when the loop wraps around continue seamlessly.
+    """
+    loop_start, period = loop
+    spawn_position = np.asarray(spawn_position, dtype=np.float64)
+    exit_position = np.asarray(exit_position, dtype=np.float64)
+    travel = end_frame - start_frame
+    hidden_frames = max(period - travel - LINGER_FRAMES, 1)
+    
+    def state(age):
+        """Position and hidden flag of the line a number of frames after it spawned"""
+        if age < travel:
+            return spawn_position + (exit_position - spawn_position) * (age / travel), False
+        if age < travel + LINGER_FRAMES:
+            return exit_position, False
+        # Moves back while hidden, as the keys interpolate towards the next spawn
+        back = (age - travel - LINGER_FRAMES) / hidden_frames
+        return exit_position + (spawn_position - exit_position) * back, True
+    
+    location_keys = []
+    hide_keys = []
+    boundary_age = (loop_start - start_frame) % period
+    for age in (0, travel, travel + LINGER_FRAMES):
+        frame = loop_start + (start_frame - loop_start + age) % period
+        position, hidden = state(age)
+        location_keys.append((frame, position))
+        hide_keys.append((frame, hidden))
+    position, hidden = state(boundary_age)
+    for frame in (loop_start, loop_start + period):
+        location_keys.append((frame, position))
+        hide_keys.append((frame, hidden))
+    
+    visibility_mode = 'SCALE' if visibility_mode == 'SHADER' else visibility_mode
+    write_line_keyframes(obj, location_keys, hide_keys, visibility_mode, cyclic=True)
+
+# Name of the material node that marks the shader visibility setup
+VISIBILITY_NODE = "SpeedLines Visibility"
+
+def set_visibility_nodes(mat, enabled):
+    """Add or remove the nodes that make a line transparent outside its visible frames.
+    
+    The line's spawn and hide frames come from its object properties and
+    the current frame from a driver, so showing and hiding lines never
+    changes the depsgraph.
+    """
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+    # The per-line fade mixes the emission with transparency before the visibility does
+    emission = nodes.get(FADE_NODE) or next((node for node in nodes if node.type == 'EMISSION'), None)
+    output = next((node for node in nodes if node.type == 'OUTPUT_MATERIAL'), None)
+    mix = nodes.get(VISIBILITY_NODE)
+    if emission is None or output is None or enabled == (mix is not None):
+        return
+    
+    if not enabled:
+        for node in list(nodes):
+            if node.name.startswith(VISIBILITY_NODE):
+                nodes.remove(node)
+        links.new(emission.outputs[0], output.inputs['Surface'])
+        return
+    
+    def add(node_type, name, location):
+        node = nodes.new(node_type)
+        node.name = name
+        node.label = name.replace(VISIBILITY_NODE, "").strip() or "Visibility"
+        node.location = location
+        return node
+    
+    frame = add('ShaderNodeValue', f"{VISIBILITY_NODE} Frame", (-600, 300))
+    frame.outputs[0].driver_add("default_value").driver.expression = "frame"
+    spawn = add('ShaderNodeAttribute', f"{VISIBILITY_NODE} Spawn", (-600, 150))
+    spawn.attribute_type = 'OBJECT'
+    spawn.attribute_name = "speedlines_spawn_frame"
+    hide = add('ShaderNodeAttribute', f"{VISIBILITY_NODE} Hide", (-600, -50))
+    hide.attribute_type = 'OBJECT'
+    hide.attribute_name = "speedlines_hide_frame"
+    
+    # Visible while spawn <= frame < hide
+    age = add('ShaderNodeMath', f"{VISIBILITY_NODE} Age", (-400, 250))
+    age.operation = 'SUBTRACT'
+    links.new(frame.outputs[0], age.inputs[0])
+    links.new(spawn.outputs['Fac'], age.inputs[1])
+    spawned = add('ShaderNodeMath', f"{VISIBILITY_NODE} Spawned", (-250, 250))
+    spawned.operation = 'GREATER_THAN'
+    links.new(age.outputs[0], spawned.inputs[0])
+    spawned.inputs[1].default_value = -0.001
+    not_hidden = add('ShaderNodeMath', f"{VISIBILITY_NODE} Not Hidden", (-250, 50))
+    not_hidden.operation = 'LESS_THAN'
+    links.new(frame.outputs[0], not_hidden.inputs[0])
+    links.new(hide.outputs['Fac'], not_hidden.inputs[1])
+    visible = add('ShaderNodeMath', f"{VISIBILITY_NODE} Visible", (-100, 150))
+    visible.operation = 'MULTIPLY'
+    links.new(spawned.outputs[0], visible.inputs[0])
+    links.new(not_hidden.outputs[0], visible.inputs[1])
+    
+    transparent = add('ShaderNodeBsdfTransparent', f"{VISIBILITY_NODE} Transparent", (0, -150))
+    mix = add('ShaderNodeMixShader', VISIBILITY_NODE, (200, 0))
+    links.new(visible.outputs[0], mix.inputs['Fac'])
+    links.new(transparent.outputs['BSDF'], mix.inputs[1])
+    links.new(emission.outputs[0], mix.inputs[2])
+    output.location = (400, 0)
+    links.new(mix.outputs['Shader'], output.inputs['Surface'])
+
+# Name of the material node that fades every line by its own random opacity
+FADE_NODE = "SpeedLines Fade"
+
+def uses_shader_visibility(props):
+    """Whether lines are shown and hidden by their material"""
+    # Only keyed line objects that don't loop carry the frames the visibility nodes read
+    return props.generation_mode == 'OBJECTS' and props.visibility_mode == 'SHADER' and not props.loop_mode
+
+def line_material_key(props):
+    """Key identifying the shading settings a line material is built from"""
+    shader_visibility = uses_shader_visibility(props)
+    color = ",".join(f"{component:.4g}" for component in props.line_color)
+    return (f"{color}:{props.emission_strength:.4g}:{int(props.use_transparency)}:{int(shader_visibility)}:"
+            f"{props.color_variation:.4g}:{props.brightness_variation:.4g}:{props.opacity_variation:.4g}")
+
+def line_material_name(key):
+    """Material name for a set of shading settings"""
+    return f"SpeedLine_Material_{zlib.crc32(key.encode()):08x}"
+
+def add_line_variation(mat, props, emission):
+    """Vary the color, brightness and opacity of every line inside one material.
+    
+    Each line gets a random value from Object Info, which differs between
+    line objects and between instances, plus white noise of the line_id
+    attribute, which differs between the lines of a merged or streamed mesh.
+    """
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+    
+    def add(node_type, location, operation=None):
+        node = nodes.new(node_type)
+        node.location = location
+        if operation is not None:
+            node.operation = operation
+        return node
+    
+    info = add('ShaderNodeObjectInfo', (-1000, 200))
+    line_id = add('ShaderNodeAttribute', (-1000, -50))
+    line_id.attribute_name = "line_id"
+    line_noise = add('ShaderNodeTexWhiteNoise', (-800, -50))
+    line_noise.noise_dimensions = '1D'
+    links.new(line_id.outputs['Fac'], line_noise.inputs['W'])
+    combined = add('ShaderNodeMath', (-600, 100), 'ADD')
+    links.new(info.outputs['Random'], combined.inputs[0])
+    links.new(line_noise.outputs['Value'], combined.inputs[1])
+    
+    def line_random(stream, amount, offset, location):
+        """Independent random value per line scaled into offset + amount * [0, 1)"""
+        shifted = add('ShaderNodeMath', location, 'ADD')
+        links.new(combined.outputs[0], shifted.inputs[0])
+        shifted.inputs[1].default_value = stream
+        noise = add('ShaderNodeTexWhiteNoise', (location[0] + 150, location[1]))
+        noise.noise_dimensions = '1D'
+        links.new(shifted.outputs[0], noise.inputs['W'])
+        scaled = add('ShaderNodeMath', (location[0] + 300, location[1]), 'MULTIPLY_ADD')
+        links.new(noise.outputs['Value'], scaled.inputs[0])
+        scaled.inputs[1].default_value = amount
+        scaled.inputs[2].default_value = offset
+        return scaled.outputs[0]
+    
+    if props.color_variation > 0:
+        hue = add('ShaderNodeHueSaturation', (-150, 150))
+        hue.inputs['Color'].default_value = (*props.line_color, 1.0)
+        links.new(line_random(1.0, props.color_variation, 0.5 - props.color_variation / 2, (-600, 300)),
+                  hue.inputs['Hue'])
+        links.new(hue.outputs['Color'], emission.inputs['Color'])
+    
+    if props.brightness_variation > 0:
+        strength = props.emission_strength
+        links.new(line_random(2.0, -strength * props.brightness_variation, strength, (-600, -150)),
+                  emission.inputs['Strength'])
+    
+    if props.opacity_variation > 0 and props.use_transparency:
+        transparent = add('ShaderNodeBsdfTransparent', (0, -200))
+        fade = add('ShaderNodeMixShader', (150, 0))
+        fade.name = FADE_NODE
+        fade.label = "Fade"
+        links.new(line_random(3.0, -props.opacity_variation, 1.0, (-600, -350)), fade.inputs['Fac'])
+        links.new(transparent.outputs['BSDF'], fade.inputs[1])
+        links.new(emission.outputs['Emission'], fade.inputs[2])
+
+def build_line_material(props, name):
+    """Build the line material for the current shading settings"""
+    mat = bpy.data.materials.new(name=name)
+    mat.use_nodes = True
+    nodes = mat.node_tree.nodes
+    nodes.clear()
+    
+    emission = nodes.new(type='ShaderNodeEmission')
+    emission.location = (0, 0)
+    emission.inputs['Strength'].default_value = props.emission_strength
+    emission.inputs['Color'].default_value = (*props.line_color, 1.0)
+    output = nodes.new(type='ShaderNodeOutputMaterial')
+    output.location = (300, 0)
+    
+    if props.color_variation > 0 or props.brightness_variation > 0 or props.opacity_variation > 0:
+        add_line_variation(mat, props, emission)
+    surface = nodes.get(FADE_NODE) or emission
+    mat.node_tree.links.new(surface.outputs[0], output.inputs['Surface'])
+    
+    shader_visibility = uses_shader_visibility(props)
+    set_visibility_nodes(mat, shader_visibility)
+    if props.use_transparency:
+        mat.blend_method = 'ALPHA'
+    else:
+        mat.blend_method = 'HASHED' if shader_visibility else 'OPAQUE'
+    return mat
+
+def is_line_material(mat):
+    """Whether a material was made for speed lines, including the unkeyed one of older versions"""
+    return mat is not None and (mat.get("speedlines_material_key") is not None
+                                or mat.name == "SpeedLine_Material")
+
+def remove_unused_line_materials():
+    """Remove line materials no object uses any more, returning how many were removed"""
+    unused = [mat for mat in bpy.data.materials
+              if mat.get("speedlines_material_key") is not None and mat.users == 0]
+    bpy.data.batch_remove(unused)
+    return len(unused)
+
+def line_template_key(props, level=None):
+    """Key identifying line geometry that can be shared between lines, at a level of detail"""
+    line_type = props.line_type
+    if level is not None and level != base_lod_level(line_type):
+        line_type, segments = LOD_LEVELS[level]
+        if line_type == 'TUBE':
+            line_type = f"TUBE{segments}"
+    return (f"{line_type}:{props.line_length:.6g}:"
+            f"{props.line_width:.6g}:{props.taper_factor:.6g}")
+
+def line_template_name(key):
+    """Mesh name for a shared line template"""
+    line_type = key.split(":", 1)[0]
+    return f"SpeedLine_{line_type.title()}_{zlib.crc32(key.encode()):08x}"
+
+def add_group_socket(tree, name, in_out, socket_type):
+    """Add an input or output socket to a node group"""
+    if hasattr(tree, "interface"):
+        # Blender 4.0+
+        return tree.interface.new_socket(name=name, in_out=in_out, socket_type=socket_type)
+    sockets = tree.inputs if in_out == 'INPUT' else tree.outputs
+    return sockets.new(socket_type, name)
+
+def new_node(tree, node_type, location):
+    """Add a node to a node tree at a location"""
+    node = tree.nodes.new(node_type)
+    node.location = location
+    return node
+
+def math_node(tree, operation, location):
+    """Add a float math node"""
+    node = new_node(tree, 'ShaderNodeMath', location)
+    node.operation = operation
+    return node
+
+def compare_node(tree, operation, location):
+    """Add a float compare node"""
+    node = new_node(tree, 'FunctionNodeCompare', location)
+    node.data_type = 'FLOAT'
+    node.operation = operation
+    return node
+
+def named_attribute_node(tree, name, data_type, location):
+    """Add a node reading a named attribute"""
+    node = new_node(tree, 'GeometryNodeInputNamedAttribute', location)
+    node.data_type = data_type
+    node.inputs['Name'].default_value = name
+    return node
+
+def attribute_output(node):
+    """The output socket of a named attribute node that matches its data type"""
+    return next(socket for socket in node.outputs if socket.enabled)
+
+@persistent
+def speedlines_stream_in(scene, depsgraph=None):
+    """Enable the chunks of lines around the new frame in viewports and disable the rest.
+    
+    Every line was created by the generate operator, this only toggles the
+    visibility of existing collections.
+    """
+    props = getattr(scene, "speedlines_props", None)
+    if props is None or props.frame_window != 'CHUNK':
+        return
+    collection = bpy.data.collections.get("SpeedLines")
+    if collection is None:
+        return
+    
+    # Renders show every chunk, only viewports skip the disabled ones
+    if hasattr(bpy.app, "is_job_running") and bpy.app.is_job_running('RENDER'):
+        return
+    
+    show_line_chunks(collection, scene.frame_current, props.chunk_frames // 2)
+
+class SPEEDLINES_OT_speed_preset(bpy.types.Operator):
+    """Apply Speed Preset"""
+    bl_idname = "speedlines.speed_preset"
+    bl_label = "Speed Preset"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    preset_type: bpy.props.EnumProperty(
+        items=[
+            ('SLOW', "Slow Flow", "Gentle, slow-moving lines"),
+            ('FAST', "Fast Flow", "Quick-moving lines"),
+            ('BULLET_TIME', "Bullet Time", "Ultra-fast speed lines")
+        ]
+    )
+    
+    def execute(self, context):
+        props = context.scene.speedlines_props
+        
+        if self.preset_type == 'SLOW':
+            props.speed_units_per_second = 2.0
+            props.animation_speed = 0.5
+            props.animation_duration = 800.0  # Very long for slow random spawning
+            props.cycle_length = 2.0
+            props.line_count = 250
+            props.spawn_randomness = 0.7
+        elif self.preset_type == 'FAST':
+            props.speed_units_per_second = 15.0
+            props.animation_speed = 2.0
+            props.animation_duration = 400.0
+            props.cycle_length = 1.5
+            props.line_count = 300
+            props.spawn_randomness = 0.8
+        elif self.preset_type == 'BULLET_TIME':
+            props.speed_units_per_second = 40.0
+            props.animation_speed = 5.0
+            props.animation_duration = 200.0
+            props.cycle_length = 1.0
+            props.line_count = 200
+            props.spawn_randomness = 0.9
+        
+        self.report({'INFO'}, f"Applied {self.preset_type.replace('_', ' ').title()} preset - random forward flow!")
+        return {'FINISHED'}
+
+class SPEEDLINES_OT_continuous_flow(bpy.types.Operator):
+    """Setup Perfect Continuous Flow"""
+    bl_idname = "speedlines.continuous_flow"
+    bl_label = "Continuous Flow Setup"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    def execute(self, context):
+        props = context.scene.speedlines_props
+        
+        # Optimal settings for permanent forward motion with random spawning
+        props.animation_duration = 600.0  # Longer duration for extended spawning
+        props.animation_speed = 1.0
+        props.cycle_length = 1.0  # Not really used in new system
+        props.spawn_randomness = 0.9  # Very random spawning
+        props.line_count = 300  # More lines for continuous random effect
+        props.pattern = 'PARALLEL'
+        props.line_type = 'TAPERED'
+        props.flow_direction = (1.0, 0.0, 0.0)
+        props.line_length = 2.0  # Shorter lines for denser effect
+        props.randomness = 0.2  # Some position randomness
+        
+        self.report({'INFO'}, "Set up random spawning permanent forward flow!")
+        return {'FINISHED'}
+
+class SpeedLinesGenerator:
+    """Speed line building steps shared by the generate operators"""
+    
+    _profile = NULL_PROFILE
+    
+    # Frame window of the last generation and the lines left out by it
+    _window = None
+    _skipped_lines = 0
+    _culled_lines = 0
+    
+    # (loop_start, period) of a looping generation
+    _loop = None
+    
+    # Level of detail of every line by row, None when all lines use the line type
+    _lod_levels = None
+    _lod_triangles = 0
+    
+    def begin_profile(self, props):
+        """Start timing generation phases if profiling is enabled"""
+        if props.profile_generation:
+            self._profile = GenerationProfile(props.profile_cprofile)
+        else:
+            self._profile = NULL_PROFILE
+    
+    def end_profile(self, props):
+        """Report the phase times and append them to the profiling log"""
+        global last_profile
+        profile = self._profile
+        self._profile = NULL_PROFILE
+        if profile is NULL_PROFILE:
+            return
+        
+        self.report({'INFO'}, f"Profile: {profile.summary()}")
+        try:
+            last_profile = write_profile_log(profile, props)
+        except OSError as e:
+            last_profile = profile.record(props)
+            self.report({'WARNING'}, f"Could not write profiling log: {str(e)}")
+    
+    def run_generation(self, context, props):
+        """Replace or update the speed lines in the current mode"""
+        # Clear existing speed lines if replace is enabled
+        if props.replace_existing:
+            if props.incremental_updates and self.update_speed_lines(context, props):
+                return
+            with self._profile.phase("clear"):
+                self.clear_speed_lines()
+        
+        # Create speed lines collection
+        collection = self.create_collection()
+        
+        # Create speed lines
+        if props.generation_mode == 'GEOMETRY_NODES':
+            self.generate_procedural_lines(props, collection)
+        elif props.generation_mode == 'MERGED':
+            self.generate_procedural_lines(props, collection, merged=True)
+        elif props.generation_mode == 'STREAMING':
+            self.generate_streaming_lines(props, collection)
+        else:
+            self.generate_speed_lines(props, collection)
+        
+        with self._profile.phase("finish"):
+            self.finish_generation(context, props, collection)
+    
+    def finish_generation(self, context, props, collection):
+        """Add the controller and refresh the scene once all lines exist"""
+        # Create control object
+        control_obj = self.create_control_object(props, collection)
+        control_obj["speedlines_fingerprint"] = json.dumps(generation_fingerprint(props))
+        if self._window is not None:
+            control_obj["speedlines_window"] = self._window
+        
+        # Materials of replaced generations with other settings are not used any more
+        remove_unused_line_materials()
+        
+        state_obj = find_line_state(collection)
+        if line_chunks(collection) and state_obj is not None:
+            lines = [obj for obj in collection.all_objects if "line_index" in obj]
+            update_chunk_frames(collection, lines, read_line_state(state_obj.data))
+            show_line_chunks(collection, context.scene.frame_current, props.chunk_frames // 2)
+        
+        shown = apply_viewport_display(collection, props.viewport_display, props.seed)
+        
+        # Evaluate the new keyframes once at the current frame
+        context.scene.frame_set(context.scene.frame_current)
+        
+        created = props.line_count - self._skipped_lines - self._culled_lines
+        details = []
+        if self._skipped_lines:
+            details.append(f"skipped {self._skipped_lines} never visible in frames {self._window[0]}-{self._window[1]}")
+        if self._culled_lines:
+            kept = " (thinned)" if props.camera_culling == 'THIN' else ""
+            details.append(f"skipped {self._culled_lines} outside the camera view{kept}")
+        if self._loop is not None:
+            details.append(f"looping every {self._loop[1]} frames")
+        if self._lod_levels is not None:
+            details.append(f"{self._lod_triangles} triangles")
+        if props.generation_mode == 'OBJECTS' and props.viewport_display < 100:
+            details.append(f"{shown} shown in viewports")
+        if props.triangle_budget and self._lod_levels is not None and self._lod_triangles > props.triangle_budget:
+            self.report({'WARNING'}, f"Lines need {self._lod_triangles} triangles, more than the budget of "
+                                     f"{props.triangle_budget}, coarser lines would not render")
+        if self._loop is not None and props.generation_mode == 'OBJECTS' and props.visibility_mode == 'SHADER':
+            self.report({'WARNING'}, "Shader Fade does not work with looping lines, they are scaled to zero while hidden instead")
+        if details:
+            self.report({'INFO'}, f"Generated {created} animated speed lines, {', '.join(details)}")
+        else:
+            self.report({'INFO'}, f"Generated {created} animated speed lines!")
+    
+    def clear_speed_lines(self):
+        """Remove existing speed lines and every datablock they were built from"""
+        return remove_generated_datablocks()
+    
+    def create_collection(self):
+        """Create or get the speed lines collection"""
+        if "SpeedLines" not in bpy.data.collections:
+            collection = tag_generated(bpy.data.collections.new("SpeedLines"))
+            bpy.context.scene.collection.children.link(collection)
+        else:
+            collection = bpy.data.collections["SpeedLines"]
+        return collection
+    
+    def create_control_object(self, props, collection):
+        """Create a control object for animation properties"""
+        # Create empty object for controls
+        bpy.ops.object.empty_add(type='SPHERE', location=props.zone_center)
+        control_obj = tag_generated(bpy.context.active_object)
+        control_obj.name = "SpeedLines_Controller"
+        control_obj.empty_display_size = 0.5
+        
+        # Move to collection safely
+        if control_obj.name in bpy.context.scene.collection.objects:
+            bpy.context.scene.collection.objects.unlink(control_obj)
+        collection.objects.link(control_obj)
+        
+        # Add custom properties
+        self.write_controller_properties(control_obj, props)
+        
+        # Add property UI settings
+        control_obj.id_properties_ui("speed_units_per_second").update(min=0.1, max=200.0)
+        control_obj.id_properties_ui("animation_speed").update(min=0.1, max=50.0)
+        control_obj.id_properties_ui("animation_duration").update(min=60.0, max=2000.0)
+        control_obj.id_properties_ui("flow_direction_x").update(min=-1.0, max=1.0)
+        control_obj.id_properties_ui("flow_direction_y").update(min=-1.0, max=1.0)
+        control_obj.id_properties_ui("flow_direction_z").update(min=-1.0, max=1.0)
+        control_obj.id_properties_ui("cycle_length").update(min=1.0, max=50.0)
+        control_obj.id_properties_ui("spawn_randomness").update(min=0.0, max=1.0)
+        
+        return control_obj
+    
+    def write_controller_properties(self, control_obj, props):
+        """Copy the animation properties onto the controller"""
+        control_obj["speed_units_per_second"] = props.speed_units_per_second
+        control_obj["animation_speed"] = props.animation_speed
+        control_obj["animation_duration"] = props.animation_duration
+        control_obj["flow_direction_x"] = props.flow_direction[0]
+        control_obj["flow_direction_y"] = props.flow_direction[1]
+        control_obj["flow_direction_z"] = props.flow_direction[2]
+        control_obj["cycle_length"] = props.cycle_length
+        control_obj["spawn_randomness"] = props.spawn_randomness
+    
+    def update_speed_lines(self, context, props):
+        """Update the existing generation in place when possible.
+        
+        Returns False when nothing was updated and the lines have to be
+        regenerated from scratch.
+        """
+        control_obj = bpy.data.objects.get("SpeedLines_Controller")
+        collection = bpy.data.collections.get("SpeedLines")
+        if control_obj is None or collection is None or "speedlines_fingerprint" not in control_obj:
+            return False
+        
+        old_fingerprint = json.loads(control_obj["speedlines_fingerprint"])
+        new_fingerprint = generation_fingerprint(props)
+        updates = plan_incremental_update(old_fingerprint, new_fingerprint)
+        if updates is None:
+            return False
+        
+        # Lines were picked for the frame range at the time
+        window = frame_window(context.scene, props)
+        old_window = control_obj.get("speedlines_window")
+        if (window is None) != (old_window is None) or (window is not None and list(old_window) != list(window)):
+            return False
+        
+        # Lines generated before the state object existed are regenerated
+        state_obj = find_line_state(collection)
+        if state_obj is None and updates & {"count", "motion"}:
+            return False
+        
+        lines = sorted((obj for obj in collection.all_objects if "line_index" in obj),
+                       key=lambda obj: obj["line_index"])
+        
+        # Retime the existing lines first, appended lines are created with the new timing
+        if "motion" in updates:
+            self.update_line_motion(props, lines, state_obj)
+        if "count" in updates:
+            lines = self.update_line_count(props, collection, lines, state_obj)
+            apply_viewport_display(collection, props.viewport_display, props.seed)
+        if "geometry" in updates:
+            self.update_line_geometry(props, lines)
+        if "material" in updates:
+            self.update_speed_line_material(props, collection)
+        if "controller" in updates or "motion" in updates:
+            self.write_controller_properties(control_obj, props)
+        
+        control_obj["speedlines_fingerprint"] = json.dumps(new_fingerprint)
+        context.scene.frame_set(context.scene.frame_current)
+        
+        if updates:
+            self.report({'INFO'}, f"Updated speed lines: {', '.join(sorted(updates))}")
+        else:
+            self.report({'INFO'}, "Speed lines are already up to date")
+        return True
+    
+    def update_line_count(self, props, collection, lines, state_obj):
+        """Append or remove lines at the end to reach the new line count"""
+        existing = len(lines)
+        state = read_line_state(state_obj.data)
+        
+        if props.line_count < existing:
+            write_line_state(state_obj.data, subset_line_state(state, state["line_index"] < props.line_count))
+            removed = lines[props.line_count:]
+            datablocks = list(removed)
+            for obj in removed:
+                if obj.animation_data and obj.animation_data.action:
+                    datablocks.append(obj.animation_data.action)
+                if not props.share_geometry and obj.data is not None:
+                    datablocks.append(obj.data)
+            bpy.data.batch_remove(datablocks)
+            return lines[:props.line_count]
+        
+        # Only lay out and time the new lines
+        self._template_cache = {}
+        indices = np.arange(existing, props.line_count)
+        config = SpeedLinesConfig.from_properties(props)
+        layout, motion = calculate_lines(config, indices, worker_count(props))
+        for row, index in enumerate(indices):
+            self.create_animated_speed_line(props, collection, int(index), layout, motion, row)
+        write_line_state(state_obj.data, merge_line_states(state, line_state(layout, motion, indices)))
+        
+        return sorted((obj for obj in collection.all_objects if "line_index" in obj),
+                      key=lambda obj: obj["line_index"])
+    
+    def update_line_geometry(self, props, lines):
+        """Swap the shared mesh of every line for one matching the new style"""
+        self._template_cache = {}
+        mesh = self.get_line_template(props)
+        old_meshes = {obj.data for obj in lines if obj.data != mesh}
+        
+        for obj in lines:
+            obj.data = mesh
+        if lines:
+            self.apply_speed_line_material(lines[0], props)
+        
+        bpy.data.batch_remove([old for old in old_meshes if old is not None and old.users == 0])
+    
+    def update_line_motion(self, props, lines, state_obj):
+        """Rewrite the line state and the keyframes of every line for the new timing"""
+        if not lines:
+            return
+        
+        state = read_line_state(state_obj.data)
+        layout, motion = retime_line_motion(
+            props, LineLayout(state["position"], state["flow_direction"], state["cycle_offset"],
+                              state["spawn_delay"]), state["line_index"])
+        write_line_state(state_obj.data, line_state(layout, motion, state["line_index"]))
+        
+        for obj, row in zip(lines, line_state_rows(state, lines)):
+            self.add_line_animation(obj, props, (
+                Vector(motion.spawn_positions[row]),
+                Vector(motion.exit_positions[row]),
+                int(motion.start_frames[row]),
+                int(motion.end_frames[row]),
+            ))
+    
+    def generate_speed_lines(self, props, collection):
+        """Generate the speed lines based on properties"""
+        layout, motion = self.prepare_speed_lines(props)
+        rows = self.select_lines(props, motion)
+        self.create_line_state(collection, layout, motion, rows)
+        for i, target in zip(rows, self.line_collections(props, collection, motion, rows)):
+            self.create_animated_speed_line(props, target, int(i), layout, motion)
+    
+    def line_collections(self, props, collection, motion, rows):
+        """Collection every selected line is created in, a chunk collection when streaming in"""
+        if props.frame_window != 'CHUNK' or self._window is None:
+            return [collection] * len(rows)
+        return chunk_collections(collection, motion, rows, self._window[0], props.chunk_frames)
+    
+    def create_line_state(self, collection, layout, motion, rows):
+        """Create the hidden object holding the state of the keyed line objects"""
+        mesh = build_line_points(tag_generated(bpy.data.meshes.new("SpeedLines_State")),
+                                 *subset_lines(layout, motion, rows), rows)
+        return hide_line_state(tag_generated(bpy.data.objects.new("SpeedLines_State", mesh)), collection)
+    
+    def select_lines(self, props, motion):
+        """Indices of the lines to create, with their level of detail picked"""
+        rows = self.cull_lines(props, motion)
+        self.select_lod(props, motion, rows)
+        return rows
+    
+    def select_lod(self, props, motion, rows):
+        """Pick the level of detail of lines from their size in the camera and the triangle budget"""
+        self._lod_levels = None
+        use_lod = props.use_lod and props.line_type == 'TUBE'
+        if props.generation_mode not in ('OBJECTS', 'MERGED') or not (use_lod or props.triangle_budget):
+            return None
+        
+        scene = bpy.context.scene
+        base = base_lod_level(props.line_type)
+        if scene.camera is not None:
+            widths = projected_line_widths(scene, scene.camera, motion, rows, 2 * props.line_width) * props.lod_bias
+        else:
+            widths = np.zeros(len(rows))
+        if use_lod and scene.camera is not None:
+            levels = lod_levels(widths, props.line_type)
+        else:
+            levels = np.full(len(rows), base)
+        if props.triangle_budget:
+            # Lines smallest on screen lose detail first
+            levels = apply_triangle_budget(levels, widths, props.triangle_budget)
+        
+        self._lod_triangles = int(LOD_TRIANGLES[levels].sum())
+        self._lod_levels = np.full(len(motion.start_frames), base)
+        self._lod_levels[rows] = levels
+        return self._lod_levels
+    
+    def cull_lines(self, props, motion):
+        """Indices of the lines visible inside the frame window and to the camera"""
+        scene = bpy.context.scene
+        # Looping lines come back every period, so every line shows up in any window
+        self._window = frame_window(scene, props) if self._loop is None else None
+        if self._window is None:
+            rows = np.arange(len(motion.start_frames))
+        else:
+            rows = lines_in_window(motion, *self._window)
+        self._skipped_lines = len(motion.start_frames) - len(rows)
+        
+        self._culled_lines = 0
+        if props.camera_culling == 'OFF' or scene.camera is None or not len(rows):
+            return rows
+        
+        margins = np.full(len(motion.start_frames), props.line_length / 2 + props.line_width + props.cull_margin)
+        if camera_is_animated(scene.camera):
+            first, last = self._window or (scene.frame_start, scene.frame_end)
+            frames = range(first, last + props.culling_step, props.culling_step)
+            if self._loop is None:
+                visible = lines_in_camera_view(scene, scene.camera, motion, rows, margins,
+                                               frames, props.culling_step)
+            else:
+                # Looping lines come back every period while the camera keeps moving,
+                # so a line is kept when any of its repeats comes into view
+                repeated, repeats = repeat_loop_motion(motion, self._loop, last)
+                count = len(motion.start_frames)
+                repeated_rows = (rows[np.newaxis, :] + count * np.arange(repeats)[:, np.newaxis]).ravel()
+                visible = lines_in_camera_view(scene, scene.camera, repeated, repeated_rows,
+                                               np.tile(margins, repeats), frames, props.culling_step)
+                visible = visible.reshape(repeats, len(rows)).any(axis=0)
+        else:
+            visible = lines_in_camera_view(scene, scene.camera, motion, rows, margins)
+        
+        if props.camera_culling == 'THIN':
+            # Keep a share of the unseen lines, picked the same way on every generate
+            kept = line_random(props.seed, rows, STREAM_CULL_THIN) < props.cull_keep_ratio
+            visible |= kept
+        
+        self._culled_lines = int(np.count_nonzero(~visible))
+        return rows[visible]
+    
+    def prepare_speed_lines(self, props):
+        """Lay out and time every line in vectorized chunks, or load them from the line cache"""
+        # Shared line meshes built during this generation, keyed by style
+        self._template_cache = {}
+        
+        with self._profile.phase("layout"):
+            cached = load_cached_lines(props) if props.use_line_cache else None
+            if cached is not None:
+                layout, motion = cached
+            else:
+                layout, motion = calculate_lines(SpeedLinesConfig.from_properties(props),
+                                                 np.arange(props.line_count), worker_count(props))
+            
+            self._loop = None
+            if props.loop_mode:
+                scene = bpy.context.scene
+                motion, self._loop = loop_line_motion(motion, layout.cycle_offsets,
+                                                      scene.frame_start, scene.frame_end)
+        return layout, motion
+    
+    def create_animated_speed_line(self, props, collection, index, layout, motion, row=None):
+        """Create a single animated speed line.
+        
+        row is the line's entry in the layout and motion arrays, which is
+        its index unless the arrays only hold a subset of the lines.
+        """
+        if row is None:
+            row = index
+        
+        profile = self._profile
+        
+        # Create mesh and object
+        with profile.phase("mesh"):
+            level = None if self._lod_levels is None else int(self._lod_levels[row])
+            if props.share_geometry:
+                mesh = self.get_line_template(props, level)
+            else:
+                mesh = self.build_line_mesh(props, f"SpeedLine_{index}", level)
+        
+        with profile.phase("object"):
+            obj = tag_generated(bpy.data.objects.new(f"SpeedLine_{index}", mesh))
+            collection.objects.link(obj)
+            
+            position = Vector(layout.positions[row])
+            flow_direction = Vector(layout.directions[row])
+            
+            # Position and orient the object
+            obj.location = position
+            
+            # Rotate object to point in flow direction
+            if flow_direction.length > 0.001:
+                # Calculate rotation to align X-axis with flow direction
+                x_axis = Vector((1, 0, 0))
+                rotation_quat = x_axis.rotation_difference(flow_direction)
+                obj.rotation_euler = rotation_quat.to_euler()
+            
+            # The rest of the line data lives in the SpeedLines_State object
+            obj["line_index"] = index
+            if "speedlines_chunk" in collection:
+                obj["speedlines_chunk"] = collection["speedlines_chunk"]
+        
+        # Apply material
+        with profile.phase("material"):
+            self.apply_speed_line_material(obj, props)
+        
+        # Add animation
+        with profile.phase("animation"):
+            self.add_line_animation(obj, props, (
+                Vector(motion.spawn_positions[row]),
+                Vector(motion.exit_positions[row]),
+                int(motion.start_frames[row]),
+                int(motion.end_frames[row]),
+            ))
+    
+    def generate_procedural_lines(self, props, collection, merged=False):
+        """Generate all speed lines as one procedurally animated object.
+        
+        By default every line is an instance on a single point cloud. With
+        merged=True all lines are written into one mesh instead, every vertex
+        carrying the data of the line it belongs to.
+        """
+        profile = self._profile
+        layout, motion = self.prepare_speed_lines(props)
+        rows = self.select_lines(props, motion)
+        layout, motion = subset_lines(layout, motion, rows)
+        
+        with profile.phase("mesh"):
+            if merged:
+                if self._lod_levels is not None:
+                    geometry, line_ids = merge_lod_geometry(
+                        SpeedLinesConfig.from_properties(props), self._lod_levels[rows],
+                        layout.positions, layout.directions, worker_count(props))
+                else:
+                    geometry, line_ids = merge_line_geometry(
+                        line_geometry(props), layout.positions, layout.directions, worker_count(props))
+                mesh = write_line_geometry(tag_generated(bpy.data.meshes.new("SpeedLines_Merged")), geometry)
+                line_id = mesh.attributes.new("line_id", 'INT', 'POINT')
+                line_id.data.foreach_set("value", line_ids.astype(np.int32))
+                add_line_attributes(mesh, layout, motion, line_ids)
+            else:
+                mesh = build_line_points(tag_generated(bpy.data.meshes.new("SpeedLines_Points")),
+                                         layout, motion, rows)
+        
+        if merged:
+            template = None
+            obj = tag_generated(bpy.data.objects.new("SpeedLines_Merged", mesh))
+            self.apply_speed_line_material(obj, props)
+        else:
+            # Hidden object holding the line geometry that gets instanced
+            template = tag_generated(bpy.data.objects.new("SpeedLines_Template", self.get_line_template(props)))
+            collection.objects.link(template)
+            template.hide_viewport = True
+            template.hide_render = True
+            self.apply_speed_line_material(template, props)
+            obj = tag_generated(bpy.data.objects.new("SpeedLines_Procedural", mesh))
+        collection.objects.link(obj)
+        
+        with profile.phase("node_tree"):
+            modifier = obj.modifiers.new("SpeedLines", 'NODES')
+            modifier.node_group = self.create_procedural_node_group(template, self._loop)
+        
+        return obj
+    
+    def generate_streaming_lines(self, props, collection):
+        """Generate all speed lines as one mesh rewritten on every frame change.
+        
+        The line state lives in a hidden point cloud and the line shape in a
+        hidden template object. speedlines_stream_update writes only the lines
+        visible at the current frame into the SpeedLines_Stream mesh.
+        """
+        profile = self._profile
+        layout, motion = self.prepare_speed_lines(props)
+        rows = self.select_lines(props, motion)
+        layout, motion = subset_lines(layout, motion, rows)
+        
+        with profile.phase("mesh"):
+            state = build_line_points(tag_generated(bpy.data.meshes.new("SpeedLines_StreamState")),
+                                      layout, motion, rows)
+            template_mesh = self.get_line_template(props)
+        
+        # Hidden objects keep the state and line shape in the file
+        state_obj = tag_generated(bpy.data.objects.new("SpeedLines_StreamState", state))
+        template = tag_generated(bpy.data.objects.new("SpeedLines_Template", template_mesh))
+        for hidden in (state_obj, template):
+            collection.objects.link(hidden)
+            hidden.hide_viewport = True
+            hidden.hide_render = True
+        
+        obj = tag_generated(bpy.data.objects.new(
+            "SpeedLines_Stream", tag_generated(bpy.data.meshes.new("SpeedLines_Stream"))))
+        if self._loop is not None:
+            state_obj["speedlines_loop"] = self._loop
+        obj["speedlines_stream_state"] = state_obj.name
+        obj["speedlines_stream_template"] = template.name
+        collection.objects.link(obj)
+        self.apply_speed_line_material(obj, props)
+        
+        # The mesh must not change while a render reads it, which only Lock Interface prevents.
+        # It is a saved render setting of the user's file, so ask for it instead of setting it.
+        if not bpy.context.scene.render.use_lock_interface:
+            self.report({'WARNING'}, "Enable Render > Lock Interface before rendering streamed speed lines")
+        
+        _line_streams.pop(obj.name, None)
+        return obj
+    
+    def create_procedural_node_group(self, template=None, loop=None):
+        """Build the node tree that moves and shows lines from the scene time.
+        
+        With a template object the lines are instanced on the points,
+        without one the geometry is moved as is and hidden lines are deleted.
+        With a (loop_start, period) loop every line repeats once per period.
+        """
+        tree = tag_generated(bpy.data.node_groups.new("SpeedLines_Procedural", 'GeometryNodeTree'))
+        if hasattr(tree, "is_modifier"):
+            tree.is_modifier = True
+        add_group_socket(tree, "Geometry", 'INPUT', 'NodeSocketGeometry')
+        add_group_socket(tree, "Geometry", 'OUTPUT', 'NodeSocketGeometry')
+        
+        links = tree.links
+        
+        group_in = new_node(tree, 'NodeGroupInput', (-1000, 0))
+        group_out = new_node(tree, 'NodeGroupOutput', (800, 0))
+        
+        # Per-line attributes written by generate_procedural_lines
+        direction = named_attribute_node(tree, "flow_direction", 'FLOAT_VECTOR', (-1000, -200))
+        spawn = named_attribute_node(tree, "spawn_frame", 'FLOAT', (-1000, -350))
+        travel = named_attribute_node(tree, "travel_frames", 'FLOAT', (-1000, -500))
+        distance = named_attribute_node(tree, "travel_distance", 'FLOAT', (-1000, -650))
+        
+        scene_time = new_node(tree, 'GeometryNodeInputSceneTime', (-1000, 200))
+        
+        # Frames since the line spawned
+        age = math_node(tree, 'SUBTRACT', (-750, 200))
+        links.new(scene_time.outputs['Frame'], age.inputs[0])
+        links.new(attribute_output(spawn), age.inputs[1])
+        
+        if loop is not None:
+            # Frames since the line last spawned: age - period * floor(age / period)
+            period = loop[1]
+            cycles = math_node(tree, 'DIVIDE', (-750, 400))
+            links.new(age.outputs[0], cycles.inputs[0])
+            cycles.inputs[1].default_value = period
+            whole_cycles = math_node(tree, 'FLOOR', (-600, 400))
+            links.new(cycles.outputs[0], whole_cycles.inputs[0])
+            cycle_frames = math_node(tree, 'MULTIPLY', (-450, 400))
+            links.new(whole_cycles.outputs[0], cycle_frames.inputs[0])
+            cycle_frames.inputs[1].default_value = period
+            wrapped_age = math_node(tree, 'SUBTRACT', (-300, 400))
+            links.new(age.outputs[0], wrapped_age.inputs[0])
+            links.new(cycle_frames.outputs[0], wrapped_age.inputs[1])
+            age = wrapped_age
+        
+        # Progress along the path, 0 at spawn and 1 at exit
+        progress = math_node(tree, 'DIVIDE', (-550, 200))
+        progress.use_clamp = True
+        links.new(age.outputs[0], progress.inputs[0])
+        links.new(attribute_output(travel), progress.inputs[1])
+        
+        # Offset from the base position: -distance/2 at spawn, +distance/2 at exit
+        centered = math_node(tree, 'SUBTRACT', (-350, 200))
+        links.new(progress.outputs[0], centered.inputs[0])
+        centered.inputs[1].default_value = 0.5
+        
+        offset_length = math_node(tree, 'MULTIPLY', (-150, 200))
+        links.new(centered.outputs[0], offset_length.inputs[0])
+        links.new(attribute_output(distance), offset_length.inputs[1])
+        
+        offset = new_node(tree, 'ShaderNodeVectorMath', (50, 200))
+        offset.operation = 'SCALE'
+        links.new(attribute_output(direction), offset.inputs[0])
+        links.new(offset_length.outputs[0], offset.inputs['Scale'])
+        
+        set_position = new_node(tree, 'GeometryNodeSetPosition', (250, 0))
+        links.new(group_in.outputs['Geometry'], set_position.inputs['Geometry'])
+        links.new(offset.outputs['Vector'], set_position.inputs['Offset'])
+        
+        # Visible from the spawn frame until LINGER_FRAMES after the exit frame, like keyed lines
+        hide_frame = math_node(tree, 'ADD', (-550, -200))
+        links.new(attribute_output(travel), hide_frame.inputs[0])
+        hide_frame.inputs[1].default_value = float(LINGER_FRAMES)
+        
+        spawned = compare_node(tree, 'GREATER_EQUAL', (-350, -100))
+        links.new(age.outputs[0], spawned.inputs[0])
+        spawned.inputs[1].default_value = 0.0
+        
+        not_gone = compare_node(tree, 'LESS_THAN', (-350, -250))
+        links.new(age.outputs[0], not_gone.inputs[0])
+        links.new(hide_frame.outputs[0], not_gone.inputs[1])
+        
+        visible = new_node(tree, 'FunctionNodeBooleanMath', (-150, -150))
+        visible.operation = 'AND'
+        links.new(spawned.outputs[0], visible.inputs[0])
+        links.new(not_gone.outputs[0], visible.inputs[1])
+        
+        if template is None:
+            hidden = new_node(tree, 'FunctionNodeBooleanMath', (250, -200))
+            hidden.operation = 'NOT'
+            links.new(visible.outputs[0], hidden.inputs[0])
+            
+            delete = new_node(tree, 'GeometryNodeDeleteGeometry', (550, 0))
+            delete.domain = 'POINT'
+            links.new(set_position.outputs['Geometry'], delete.inputs['Geometry'])
+            links.new(hidden.outputs[0], delete.inputs['Selection'])
+            
+            links.new(delete.outputs['Geometry'], group_out.inputs['Geometry'])
+            return tree
+        
+        # Point the line's X axis along its flow direction
+        try:
+            align = new_node(tree, 'FunctionNodeAlignRotationToVector', (250, -300))
+        except RuntimeError:
+            align = new_node(tree, 'FunctionNodeAlignEulerToVector', (250, -300))
+        align.axis = 'X'
+        links.new(attribute_output(direction), align.inputs['Vector'])
+        
+        template_info = new_node(tree, 'GeometryNodeObjectInfo', (250, -500))
+        template_info.transform_space = 'ORIGINAL'
+        template_info.inputs['Object'].default_value = template
+        
+        instance = new_node(tree, 'GeometryNodeInstanceOnPoints', (550, 0))
+        links.new(set_position.outputs['Geometry'], instance.inputs['Points'])
+        links.new(visible.outputs[0], instance.inputs['Selection'])
+        links.new(template_info.outputs['Geometry'], instance.inputs['Instance'])
+        links.new(align.outputs[0], instance.inputs['Rotation'])
+        
+        links.new(instance.outputs['Instances'], group_out.inputs['Geometry'])
+        
+        return tree
+    
+    def build_line_mesh(self, props, name, level=None):
+        """Build the line geometry in standard orientation (along X-axis), at a level of detail"""
+        mesh = tag_generated(bpy.data.meshes.new(name))
+        # Unshared meshes of one style get the same geometry, compute it once per generation
+        key = line_template_key(props, level)
+        if not hasattr(self, "_geometry_cache"):
+            self._geometry_cache = {}
+        geometry = self._geometry_cache.get(key)
+        if geometry is None:
+            geometry = line_geometry(props) if level is None else lod_geometry(props, level)
+            self._geometry_cache[key] = geometry
+        return write_line_geometry(mesh, geometry)
+    
+    def get_line_template(self, props, level=None):
+        """Get the shared mesh for the current line style and level of detail, building it once"""
+        key = line_template_key(props, level)
+        cache = getattr(self, "_template_cache", {})
+        mesh = cache.get(key)
+        if mesh is not None:
+            return mesh
+        
+        # Reuse a template left by an earlier generation with the same style
+        name = line_template_name(key)
+        mesh = bpy.data.meshes.get(name)
+        if mesh is None or mesh.get("speedlines_template_key") != key:
+            mesh = self.build_line_mesh(props, name, level)
+            mesh["speedlines_template_key"] = key
+        
+        cache[key] = mesh
+        return mesh
+    
+    def get_line_material(self, props):
+        """The material for the current shading settings, built once per set of settings"""
+        if not hasattr(self, "_material_cache"):
+            self._material_cache = {}
+        key = line_material_key(props)
+        mat = self._material_cache.get(key)
+        if mat is not None:
+            return mat
+        
+        # Reuse a material left by an earlier generation with the same settings
+        name = line_material_name(key)
+        mat = bpy.data.materials.get(name)
+        if mat is None or mat.get("speedlines_material_key") != key:
+            mat = build_line_material(props, name)
+            mat["speedlines_material_key"] = key
+        
+        self._material_cache[key] = mat
+        return mat
+    
+    def apply_speed_line_material(self, obj, props):
+        """Apply or create material for speed lines"""
+        try:
+            mat = self.get_line_material(props)
+            
+            # Apply material
+            if len(obj.data.materials) == 0:
+                obj.data.materials.append(mat)
+            else:
+                obj.data.materials[0] = mat
+                
+        except Exception as e:
+            print(f"Warning: Could not apply material to {obj.name}: {e}")
+    
+    def update_speed_line_material(self, props, collection):
+        """Give every line of a generation the material for the current appearance settings"""
+        meshes = {obj.data for obj in collection.all_objects
+                  if obj.type == 'MESH' and obj.data.materials and is_line_material(obj.data.materials[0])}
+        if meshes:
+            mat = self.get_line_material(props)
+            for mesh in meshes:
+                mesh.materials[0] = mat
+        remove_unused_line_materials()
+    
+    def add_line_animation(self, obj, props, motion):
+        """Add permanent forward motion with random spawning"""
+        try:
+            if self._loop is not None:
+                key_line_loop(obj, *motion, self._loop, props.visibility_mode)
+                return
+            
+            # PERMANENT FORWARD MOTION - NO CYCLING BACK
+            # Hidden before spawn, shown while travelling, hidden again after exiting
+            key_line_motion(obj, *motion, props.visibility_mode)
+            
+            # NO CYCLE MODIFIER - lines just move forward once and stay gone
+                        
+        except Exception as e:
+            print(f"Warning: Could not add animation to {obj.name}: {e}")
+
+class SPEEDLINES_OT_generate(SpeedLinesGenerator, bpy.types.Operator):
+    """Generate Animated Speed Lines"""
+    bl_idname = "speedlines.generate"
+    bl_label = "Generate Speed Lines"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    def execute(self, context):
+        try:
+            scene = context.scene
+            props = scene.speedlines_props
+            
+            self.begin_profile(props)
+            with self._profile.capture():
+                self.run_generation(context, props)
+            self.end_profile(props)
+            
+            return {'FINISHED'}
+            
+        except Exception as e:
+            self.report({'ERROR'}, f"Error generating speed lines: {str(e)}")
+            return {'CANCELLED'}
+
+class SPEEDLINES_OT_generate_modal(SpeedLinesGenerator, bpy.types.Operator):
+    """Generate speed lines in small chunks while Blender stays responsive (Esc to cancel)"""
+    bl_idname = "speedlines.generate_modal"
+    bl_label = "Generate Speed Lines in Background"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    time_budget: bpy.props.FloatProperty(
+        name="Time Budget",
+        description="Time spent building lines per timer tick (seconds)",
+        default=0.05,
+        min=0.005,
+        max=1.0
+    )
+    
+    def execute(self, context):
+        # Blocking fallback, used for redo and the procedural modes
+        return SPEEDLINES_OT_generate.execute(self, context)
+    
+    def invoke(self, context, event):
+        props = context.scene.speedlines_props
+        
+        # The procedural modes build everything in one fast pass
+        if props.generation_mode != 'OBJECTS':
+            return self.execute(context)
+        
+        self.begin_profile(props)
+        try:
+            with self._profile.capture():
+                if props.replace_existing:
+                    if props.incremental_updates and self.update_speed_lines(context, props):
+                        self.end_profile(props)
+                        return {'FINISHED'}
+                
+                # Anything tagged after this point is rolled back on cancel
+                self._existing = {id_block.as_pointer()
+                                  for ids in collect_generated_datablocks().values()
+                                  for id_block in ids}
+                
+                # The previous lines stay until the new ones are done, so cancelling keeps them
+                self._replace = props.replace_existing
+                if self._replace:
+                    self._collection = tag_generated(bpy.data.collections.new("SpeedLines_Staging"))
+                    context.scene.collection.children.link(self._collection)
+                else:
+                    self._collection = self.create_collection()
+                self._layout, self._motion = self.prepare_speed_lines(props)
+                self._rows = self.select_lines(props, self._motion)
+                self.create_line_state(self._collection, self._layout, self._motion, self._rows)
+                self._targets = self.line_collections(props, self._collection, self._motion, self._rows)
+                self._next_index = 0
+        except Exception as e:
+            self.report({'ERROR'}, f"Error generating speed lines: {str(e)}")
+            return {'CANCELLED'}
+        
+        window_manager = context.window_manager
+        self._timer = window_manager.event_timer_add(0.01, window=context.window)
+        window_manager.progress_begin(0, len(self._rows))
+        window_manager.modal_handler_add(self)
+        self.update_status(context, props)
+        return {'RUNNING_MODAL'}
+    
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.rollback()
+            self.stop(context)
+            self.report({'WARNING'}, "Speed line generation cancelled")
+            return {'CANCELLED'}
+        
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+        
+        props = context.scene.speedlines_props
+        try:
+            # Build as many lines as fit in this tick's time budget
+            tick_end = time.perf_counter() + self.time_budget
+            with self._profile.capture():
+                while self._next_index < len(self._rows) and time.perf_counter() < tick_end:
+                    self.create_animated_speed_line(
+                        props, self._targets[self._next_index], int(self._rows[self._next_index]),
+                        self._layout, self._motion)
+                    self._next_index += 1
+            
+            if self._next_index >= len(self._rows):
+                self.stop(context)
+                if self._replace:
+                    with self._profile.capture(), self._profile.phase("clear"):
+                        self.replace_previous_lines()
+                with self._profile.capture(), self._profile.phase("finish"):
+                    self.finish_generation(context, props, self._collection)
+                self.end_profile(props)
+                return {'FINISHED'}
+        except Exception as e:
+            # Also hit when an undo step freed the datablocks being built
+            self.rollback()
+            self.stop(context)
+            self.report({'ERROR'}, f"Error generating speed lines: {str(e)}")
+            return {'CANCELLED'}
+        
+        context.window_manager.progress_update(self._next_index)
+        self.update_status(context, props)
+        return {'PASS_THROUGH'}
+    
+    def update_status(self, context, props):
+        """Show generation progress in the status bar"""
+        if context.workspace is not None:
+            context.workspace.status_text_set(
+                f"Speed lines: {self._next_index}/{len(self._rows)} built (Esc to cancel)")
+    
+    def stop(self, context):
+        """Remove the timer and clear the progress display"""
+        window_manager = context.window_manager
+        window_manager.event_timer_remove(self._timer)
+        window_manager.progress_end()
+        if context.workspace is not None:
+            context.workspace.status_text_set(None)
+    
+    def replace_previous_lines(self):
+        """Delete the previous generation and give the staged lines its names"""
+        previous = [id_block
+                    for ids in collect_generated_datablocks().values()
+                    for id_block in ids
+                    if id_block.as_pointer() in self._existing]
+        # Shared line meshes of the previous generation may have been reused by the new lines
+        bpy.data.batch_remove([id_block for id_block in previous
+                               if not isinstance(id_block, (bpy.types.Mesh, bpy.types.NodeTree))])
+        bpy.data.batch_remove([id_block for id_block in previous
+                               if isinstance(id_block, (bpy.types.Mesh, bpy.types.NodeTree))
+                               and id_block.users == 0])
+        
+        self._collection.name = "SpeedLines"
+        for key, ids in collect_generated_datablocks().items():
+            for id_block in ids:
+                # Names taken by the previous lines were given a numbered suffix
+                base, dot, number = id_block.name.rpartition(".")
+                if dot and number.isdigit() and base not in getattr(bpy.data, key):
+                    id_block.name = base
+    
+    def rollback(self):
+        """Delete every datablock this run created, the previous lines are left as they were"""
+        created = [id_block
+                   for ids in collect_generated_datablocks().values()
+                   for id_block in ids
+                   if id_block.as_pointer() not in self._existing]
+        bpy.data.batch_remove(created)
+        remove_unused_line_materials()
+
+class SPEEDLINES_OT_clear(bpy.types.Operator):
+    """Remove all speed lines and the meshes, materials, actions and node groups they use"""
+    bl_idname = "speedlines.clear"
+    bl_label = "Clear Speed Lines"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    def execute(self, context):
+        removed = remove_generated_datablocks()
+        total = sum(removed.values())
+        
+        if total == 0:
+            self.report({'INFO'}, "No speed lines to clear")
+        else:
+            details = ", ".join(f"{count} {key.replace('_', ' ')}" for key, count in removed.items() if count)
+            self.report({'INFO'}, f"Reclaimed {total} datablocks ({details})")
+        return {'FINISHED'}
+
+class SPEEDLINES_OT_bake(bpy.types.Operator):
+    """Write the layout and timing of the lines to a cache file that later generations memory-map"""
+    bl_idname = "speedlines.bake"
+    bl_label = "Bake Line Cache"
+    bl_options = {'REGISTER'}
+    
+    def execute(self, context):
+        props = context.scene.speedlines_props
+        
+        try:
+            path = bake_line_cache(props)
+        except OSError as e:
+            self.report({'ERROR'}, f"Could not write line cache: {str(e)}")
+            return {'CANCELLED'}
+        
+        size = os.path.getsize(path) / (1024 * 1024)
+        self.report({'INFO'}, f"Baked {props.line_count} lines to {path} ({size:.1f} MB)")
+        return {'FINISHED'}
+
+class SPEEDLINES_OT_apply_controller(bpy.types.Operator):
+    """Retime the existing speed lines to the values on SpeedLines_Controller"""
+    bl_idname = "speedlines.apply_controller"
+    bl_label = "Apply Controller"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    @classmethod
+    def poll(cls, context):
+        return "SpeedLines_Controller" in bpy.data.objects
+    
+    def execute(self, context):
+        try:
+            count = apply_controller_settings(bpy.data.objects["SpeedLines_Controller"])
+        except ValueError as e:
+            self.report({'WARNING'}, str(e))
+            return {'CANCELLED'}
+        if count is None:
+            self.report({'INFO'}, "Speed lines already match the controller")
+        else:
+            context.scene.frame_set(context.scene.frame_current)
+            self.report({'INFO'}, f"Retimed {count} speed lines")
+        return {'FINISHED'}
+
+class SpeedLinesProperties(bpy.types.PropertyGroup):
+    """Properties for animated speed lines generation"""
+    
+    generation_mode: bpy.props.EnumProperty(
+        name="Mode",
+        description="How the speed lines are built and animated",
+        items=[
+            ('OBJECTS', "Objects", "One keyframed object per line"),
+            ('GEOMETRY_NODES', "Geometry Nodes", "All lines as instances on one point cloud, animated procedurally without keyframes"),
+            ('MERGED', "Merged Mesh", "All lines in a single mesh with per-vertex line ids, animated procedurally without keyframes"),
+            ('STREAMING', "Streaming", "One mesh rewritten on every frame change with only the lines visible at that frame")
+        ],
+        default='OBJECTS'
+    )
+    
+    frame_window: bpy.props.EnumProperty(
+        name="Frame Window",
+        description="Which lines get created, based on the frames they are visible in",
+        items=[
+            ('ALL', "All Lines", "Create every line, also those only visible after the scene range"),
+            ('SCENE', "Scene Range", "Only create lines visible somewhere in the scene frame range"),
+            ('PREVIEW', "Preview Range", "Only create lines visible somewhere in the preview range (the scene range when it is off)"),
+            ('CHUNK', "Stream In", "Create the lines of the scene range in one collection per chunk of frames, viewports only evaluate the chunks around the current frame (Objects mode)")
+        ],
+        default='ALL'
+    )
+    
+    chunk_frames: bpy.props.IntProperty(
+        name="Chunk Frames",
+        description="Frames of spawning lines in each chunk collection",
+        default=100,
+        min=10
+    )
+    
+    camera_culling: bpy.props.EnumProperty(
+        name="Camera Culling",
+        description="What to do with lines that never come into the scene camera's view",
+        items=[
+            ('OFF', "Off", "Create lines whether the camera sees them or not"),
+            ('DROP', "Drop", "Don't create lines the camera never sees"),
+            ('THIN', "Thin", "Only create a share of the lines the camera never sees")
+        ],
+        default='OFF'
+    )
+    
+    cull_keep_ratio: bpy.props.FloatProperty(
+        name="Keep Ratio",
+        description="Share of the lines outside the camera view that are still created when thinning",
+        default=0.25,
+        min=0.0,
+        max=1.0
+    )
+    
+    cull_margin: bpy.props.FloatProperty(
+        name="Cull Margin",
+        description="Extra distance outside the camera view at which lines still count as visible",
+        default=0.0,
+        min=0.0
+    )
+    
+    culling_step: bpy.props.IntProperty(
+        name="Culling Step",
+        description="Frames between the camera positions lines are tested against when the camera is animated",
+        default=5,
+        min=1
+    )
+    
+    viewport_display: bpy.props.FloatProperty(
+        name="Viewport Display",
+        description="Share of the line objects shown in viewports, the rest only render. Changing it does not regenerate the lines (Objects mode)",
+        subtype='PERCENTAGE',
+        default=100.0,
+        min=0.0,
+        max=100.0,
+        update=update_viewport_display
+    )
+    
+    visibility_mode: bpy.props.EnumProperty(
+        name="Visibility",
+        description="How line objects are shown and hidden over time",
+        items=[
+            ('HIDE', "Hide Keys", "Key hide_viewport and hide_render, exact in every view but every toggle rebuilds depsgraph relations"),
+            ('SCALE', "Scale Keys", "Key the scale to zero while hidden, objects stay enabled so playback cost stays flat"),
+            ('SHADER', "Shader Fade", "No visibility keys, the material turns transparent outside each line's frames (rendered and material preview only)")
+        ],
+        default='HIDE'
+    )
+    
+    loop_mode: bpy.props.BoolProperty(
+        name="Seamless Loop",
+        description="Every line spawns once per period, with the period chosen so the animation loops seamlessly over the scene frame range",
+        default=False
+    )
+    
+    # Zone properties
+    zone_center: bpy.props.FloatVectorProperty(
+        name="Zone Center",
+        description="Center of the speed lines zone",
+        default=(0.0, 0.0, 0.0),
+        subtype='TRANSLATION'
+    )
+    
+    zone_size: bpy.props.FloatVectorProperty(
+        name="Zone Size",
+        description="Size of the speed lines zone",
+        default=(10.0, 10.0, 5.0),
+        min=0.1
+    )
+    
+    # Line properties
+    line_count: bpy.props.IntProperty(
+        name="Line Count",
+        description="Number of speed lines to generate (more = denser random spawning)",
+        default=250,
+        min=1,
+        max=200000,
+        soft_max=2000
+    )
+    
+    line_length: bpy.props.FloatProperty(
+        name="Line Length",
+        description="Base length of speed lines",
+        default=3.0,
+        min=0.1
+    )
+    
+    line_width: bpy.props.FloatProperty(
+        name="Line Width",
+        description="Width of speed lines",
+        default=0.05,
+        min=0.001
+    )
+    
+    line_type: bpy.props.EnumProperty(
+        name="Line Type",
+        description="Type of speed lines",
+        items=[
+            ('SIMPLE', "Simple", "Simple line edges"),
+            ('TAPERED', "Tapered", "Tapered quad lines"),
+            ('TUBE', "Tube", "3D cylindrical tubes")
+        ],
+        default='TAPERED'
+    )
+    
+    share_geometry: bpy.props.BoolProperty(
+        name="Share Geometry",
+        description="Lines with the same type, length, width and taper share one mesh (linked duplicates)",
+        default=True
+    )
+    
+    # Animation properties
+    speed_units_per_second: bpy.props.FloatProperty(
+        name="Speed (Units/Sec)",
+        description="How many Blender units lines travel per second",
+        default=10.0,
+        min=0.1,
+        max=200.0
+    )
+    
+    animation_speed: bpy.props.FloatProperty(
+        name="Speed Multiplier",
+        description="Multiplier for animation speed (higher = faster)",
+        default=1.0,
+        min=0.1,
+        max=10.0
+    )
+    
+    animation_duration: bpy.props.FloatProperty(
+        name="Animation Duration",
+        description="Base duration for lines to cross zone (frames) - longer = more random spawning time",
+        default=400.0,
+        min=60.0,
+        max=2000.0
+    )
+    
+    flow_direction: bpy.props.FloatVectorProperty(
+        name="Flow Direction",
+        description="Direction lines flow through the zone",
+        default=(1.0, 0.0, 0.0),
+        subtype='DIRECTION'
+    )
+    
+    cycle_length: bpy.props.FloatProperty(
+        name="Spawn Stagger",
+        description="Time spacing between line spawns for continuous flow (frames)",
+        default=5.0,
+        min=1.0,
+        max=50.0
+    )
+    
+    spawn_randomness: bpy.props.FloatProperty(
+        name="Spawn Randomness",
+        description="How randomly spread out line spawning is (0 = regular, 1 = very random)",
+        default=0.8,
+        min=0.0,
+        max=1.0
+    )
+    
+    # Pattern properties
+    pattern: bpy.props.EnumProperty(
+        name="Pattern",
+        description="Speed lines pattern",
+        items=[
+            ('RADIAL', "Radial", "Radial pattern from center"),
+            ('PARALLEL', "Parallel", "Parallel flowing lines"),
+            ('RANDOM', "Random", "Random placement and direction")
+        ],
+        default='PARALLEL'
+    )
+    
+    spacing: bpy.props.FloatProperty(
+        name="Spacing",
+        description="Spacing between parallel lines",
+        default=0.3,
+        min=0.01
+    )
+    
+    min_distance: bpy.props.FloatProperty(
+        name="Min Distance",
+        description="Minimum distance from center (radial pattern)",
+        default=1.0,
+        min=0.0
+    )
+    
+    # Variation properties
+    randomness: bpy.props.FloatProperty(
+        name="Randomness",
+        description="Amount of randomness in positioning",
+        default=0.2,
+        min=0.0,
+        max=1.0
+    )
+    
+    seed: bpy.props.IntProperty(
+        name="Seed",
+        description="Random seed for line placement and timing, the same seed always gives the same lines",
+        default=0,
+        min=0
+    )
+    
+    length_variation: bpy.props.FloatProperty(
+        name="Length Variation",
+        description="Random variation in line length",
+        default=0.5,
+        min=0.0
+    )
+    
+    taper_factor: bpy.props.FloatProperty(
+        name="Taper Factor",
+        description="How much lines taper (0 = no taper, 1 = full taper)",
+        default=0.1,
+        min=0.0,
+        max=1.0
+    )
+    
+    use_lod: bpy.props.BoolProperty(
+        name="Level of Detail",
+        description="Give tube lines fewer segments, down to flat cards and single edges, the smaller they get in the scene camera (Objects and Merged Mesh modes)",
+        default=False
+    )
+    
+    lod_bias: bpy.props.FloatProperty(
+        name="Detail Bias",
+        description="Scale of the projected line widths levels of detail are picked from, higher keeps more detail",
+        default=1.0,
+        min=0.01,
+        max=100.0
+    )
+    
+    triangle_budget: bpy.props.IntProperty(
+        name="Triangle Budget",
+        description="Most triangles all lines together may have, lines smallest in the camera are simplified first (Objects and Merged Mesh modes, 0 = no limit)",
+        default=0,
+        min=0
+    )
+    
+    # Material properties
+    line_color: bpy.props.FloatVectorProperty(
+        name="Line Color",
+        description="Color of speed lines",
+        default=(0.3, 0.7, 1.0),
+        min=0.0,
+        max=1.0,
+        subtype='COLOR'
+    )
+    
+    emission_strength: bpy.props.FloatProperty(
+        name="Emission Strength",
+        description="Brightness of speed lines",
+        default=3.0,
+        min=0.0,
+        max=10.0
+    )
+    
+    use_transparency: bpy.props.BoolProperty(
+        name="Use Transparency",
+        description="Enable alpha blending for speed lines",
+        default=True
+    )
+    
+    color_variation: bpy.props.FloatProperty(
+        name="Color Variation",
+        description="How far the hue of every line may shift from the line color",
+        default=0.0,
+        min=0.0,
+        max=1.0,
+        subtype='FACTOR'
+    )
+    
+    brightness_variation: bpy.props.FloatProperty(
+        name="Brightness Variation",
+        description="How much dimmer than the emission strength a line may be",
+        default=0.0,
+        min=0.0,
+        max=1.0,
+        subtype='FACTOR'
+    )
+    
+    opacity_variation: bpy.props.FloatProperty(
+        name="Opacity Variation",
+        description="How much more transparent than the others a line may be (needs Use Transparency)",
+        default=0.0,
+        min=0.0,
+        max=1.0,
+        subtype='FACTOR'
+    )
+    
+    replace_existing: bpy.props.BoolProperty(
+        name="Replace Existing",
+        description="Replace existing speed lines",
+        default=True
+    )
+    
+    live_controller: bpy.props.BoolProperty(
+        name="Live Controller",
+        description="Retime the existing lines as soon as a value on SpeedLines_Controller is edited",
+        default=False
+    )
+    
+    incremental_updates: bpy.props.BoolProperty(
+        name="Incremental Updates",
+        description="When replacing, only rebuild the parts of the existing speed lines affected by the changed settings",
+        default=True
+    )
+    
+    worker_threads: bpy.props.IntProperty(
+        name="Worker Threads",
+        description="Threads computing line layout, timing and merged geometry in chunks, 0 uses one per core",
+        default=0,
+        min=0,
+        max=64
+    )
+    
+    # Cache properties
+    use_line_cache: bpy.props.BoolProperty(
+        name="Use Line Cache",
+        description="Load line layout and timing from a baked cache file with matching parameters instead of computing them",
+        default=False
+    )
+    
+    cache_directory: bpy.props.StringProperty(
+        name="Cache Directory",
+        description="Directory baked line caches are written to and read from",
+        default="//speedlines_cache/",
+        subtype='DIR_PATH'
+    )
+    
+    # Profiling properties
+    profile_generation: bpy.props.BoolProperty(
+        name="Profile Generation",
+        description="Time every generation phase and report where the time goes",
+        default=False
+    )
+    
+    profile_cprofile: bpy.props.BoolProperty(
+        name="cProfile",
+        description="Also run cProfile over the generation and save its stats next to the log",
+        default=False
+    )
+    
+    profile_log_path: bpy.props.StringProperty(
+        name="Log File",
+        description="JSON lines file every profiled generation is appended to",
+        default="//speedlines_profile.jsonl",
+        subtype='FILE_PATH'
+    )
+
+class SPEEDLINES_PT_panel(bpy.types.Panel):
+    """Animated Speed Lines Panel"""
+    bl_label = "Animated Speed Lines"
+    bl_idname = "SPEEDLINES_PT_panel"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Speed Lines"
+    
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.speedlines_props
+        
+        # Generation button
+        layout.operator("speedlines.generate", text="Generate Animated Speed Lines", icon='PLAY')
+        layout.operator("speedlines.generate_modal", icon='SORTTIME')
+        layout.operator("speedlines.clear", icon='TRASH')
+        layout.prop(props, "replace_existing")
+        if props.replace_existing:
+            layout.prop(props, "incremental_updates")
+        layout.prop(props, "generation_mode")
+        if props.generation_mode == 'OBJECTS':
+            layout.prop(props, "visibility_mode")
+            layout.prop(props, "viewport_display")
+        layout.prop(props, "loop_mode")
+        layout.prop(props, "frame_window")
+        if props.frame_window == 'CHUNK':
+            layout.prop(props, "chunk_frames")
+        layout.prop(props, "camera_culling")
+        if props.camera_culling != 'OFF':
+            col = layout.column(align=True)
+            if props.camera_culling == 'THIN':
+                col.prop(props, "cull_keep_ratio")
+            col.prop(props, "cull_margin")
+            col.prop(props, "culling_step")
+        
+        # Info about new behavior
+        info_box = layout.box()
+        info_box.label(text="💡 How it works:", icon='INFO')
+        col = info_box.column(align=True)
+        col.scale_y = 0.8
+        col.label(text="• Lines spawn randomly over time")
+        col.label(text="• Each line moves forward once & disappears")
+        col.label(text="• No cycling back - natural flowing effect")
+        
+        # Continuous flow setup
+        layout.separator()
+        box = layout.box()
+        box.label(text="Random Spawning Flow", icon='LOOP_FORWARDS')
+        box.operator("speedlines.continuous_flow", text="Setup Random Forward Flow", icon='CON_FOLLOWTRACK')
+        
+        layout.separator()
+        
+        # Zone settings
+        box = layout.box()
+        box.label(text="Zone Settings", icon='MESH_PLANE')
+        box.prop(props, "zone_center")
+        box.prop(props, "zone_size")
+        
+        # Animation settings
+        box = layout.box()
+        box.label(text="Speed & Animation", icon='TIME')
+        
+        # Speed presets
+        box.label(text="Quick Presets:", icon='PRESET')
+        row = box.row()
+        op = row.operator("speedlines.speed_preset", text="Slow")
+        op.preset_type = 'SLOW'
+        op = row.operator("speedlines.speed_preset", text="Fast")
+        op.preset_type = 'FAST'
+        op = row.operator("speedlines.speed_preset", text="Bullet Time")
+        op.preset_type = 'BULLET_TIME'
+        
+        box.separator()
+        
+        # Duration and speed controls
+        box.label(text="Animation Timing:", icon='SETTINGS')
+        box.prop(props, "animation_duration")
+        
+        row = box.row()
+        row.prop(props, "speed_units_per_second")
+        row.prop(props, "animation_speed")
+        
+        box.prop(props, "flow_direction")
+        box.prop(props, "cycle_length")
+        box.prop(props, "spawn_randomness")
+        
+        # Line settings
+        box = layout.box()
+        box.label(text="Line Settings", icon='CURVE_PATH')
+        box.prop(props, "line_count")
+        box.prop(props, "line_length")
+        box.prop(props, "line_width")
+        box.prop(props, "line_type")
+        box.prop(props, "share_geometry")
+        box.prop(props, "worker_threads")
+        
+        if props.line_type in ['TAPERED', 'TUBE']:
+            box.prop(props, "taper_factor")
+        if props.line_type == 'TUBE':
+            box.prop(props, "use_lod")
+            if props.use_lod:
+                box.prop(props, "lod_bias")
+        box.prop(props, "triangle_budget")
+        
+        # Pattern settings
+        box = layout.box()
+        box.label(text="Pattern", icon='MOD_ARRAY')
+        box.prop(props, "pattern")
+        
+        if props.pattern == 'RADIAL':
+            box.prop(props, "min_distance")
+        elif props.pattern == 'PARALLEL':
+            box.prop(props, "spacing")
+        
+        # Variation settings
+        box = layout.box()
+        box.label(text="Variation", icon='RNDCURVE')
+        box.prop(props, "randomness")
+        box.prop(props, "seed")
+        box.prop(props, "length_variation")
+        
+        # Material settings
+        box = layout.box()
+        box.label(text="Appearance", icon='MATERIAL')
+        box.prop(props, "line_color")
+        box.prop(props, "emission_strength")
+        box.prop(props, "use_transparency")
+        box.prop(props, "color_variation")
+        box.prop(props, "brightness_variation")
+        if props.use_transparency:
+            box.prop(props, "opacity_variation")
+
+class SPEEDLINES_PT_cache_panel(bpy.types.Panel):
+    """Speed Lines Cache Panel"""
+    bl_label = "Line Cache"
+    bl_idname = "SPEEDLINES_PT_cache_panel"
+    bl_parent_id = "SPEEDLINES_PT_panel"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Speed Lines"
+    bl_options = {'DEFAULT_CLOSED'}
+    
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.speedlines_props
+        
+        layout.operator("speedlines.bake", icon='FILE_CACHE')
+        layout.prop(props, "use_line_cache")
+        layout.prop(props, "cache_directory")
+        
+        # Hashing the settings and looking for the file on every redraw would slow the UI down
+        if line_cache_status is not None:
+            layout.label(text=line_cache_status[0], icon=line_cache_status[1])
+
+class SPEEDLINES_PT_profile_panel(bpy.types.Panel):
+    """Speed Lines Profiling Panel"""
+    bl_label = "Profiling"
+    bl_idname = "SPEEDLINES_PT_profile_panel"
+    bl_parent_id = "SPEEDLINES_PT_panel"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Speed Lines"
+    bl_options = {'DEFAULT_CLOSED'}
+    
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.speedlines_props
+        
+        layout.prop(props, "profile_generation")
+        col = layout.column()
+        col.active = props.profile_generation
+        col.prop(props, "profile_cprofile")
+        col.prop(props, "profile_log_path")
+        
+        if last_profile is None:
+            return
+        
+        box = layout.box()
+        box.label(text=f"Last run: {last_profile['line_count']} lines, "
+                       f"{last_profile['wall_time']:.2f}s", icon='TIME')
+        col = box.column(align=True)
+        col.scale_y = 0.8
+        wall_time = max(last_profile["wall_time"], 1e-9)
+        for name, phase in last_profile["phases"].items():
+            row = col.row()
+            row.label(text=name)
+            row.label(text=f"{phase['time']:.3f}s ({100 * phase['time'] / wall_time:.0f}%)")
+
+class SPEEDLINES_PT_control_panel(bpy.types.Panel):
+    """Speed Lines Control Panel"""
+    bl_label = "Live Controls"
+    bl_idname = "SPEEDLINES_PT_control_panel"
+    bl_space_type = 'PROPERTIES'
+    bl_region_type = 'WINDOW'
+    bl_context = "object"
+    
+    @classmethod
+    def poll(cls, context):
+        return (context.object and 
+                context.object.name == "SpeedLines_Controller")
+    
+    def draw(self, context):
+        layout = self.layout
+        obj = context.object
+        
+        col = layout.column()
+        col.label(text="Live Speed Line Controls", icon='FORCE_WIND')
+        
+        col.separator()
+        
+        if "animation_duration" in obj:
+            col.prop(obj, '["animation_duration"]', text="Animation Duration")
+        if "speed_units_per_second" in obj:
+            col.prop(obj, '["speed_units_per_second"]', text="Speed (Units/Sec)")
+        if "animation_speed" in obj:
+            col.prop(obj, '["animation_speed"]', text="Speed Multiplier")
+        if "flow_direction_x" in obj:
+            col.label(text="Flow Direction:")
+            row = col.row()
+            row.prop(obj, '["flow_direction_x"]', text="X")
+            row.prop(obj, '["flow_direction_y"]', text="Y")
+            row.prop(obj, '["flow_direction_z"]', text="Z")
+        if "cycle_length" in obj:
+            col.prop(obj, '["cycle_length"]', text="Spawn Stagger")
+        if "spawn_randomness" in obj:
+            col.prop(obj, '["spawn_randomness"]', text="Spawn Randomness")
+        
+        col.separator()
+        
+        row = col.row(align=True)
+        row.operator("speedlines.apply_controller", icon='FILE_REFRESH')
+        row.prop(context.scene.speedlines_props, "live_controller", text="Live", toggle=True)
+
+def register():
+    bpy.utils.register_class(SpeedLinesProperties)
+    bpy.utils.register_class(SPEEDLINES_OT_speed_preset)
+    bpy.utils.register_class(SPEEDLINES_OT_continuous_flow)
+    bpy.utils.register_class(SPEEDLINES_OT_generate)
+    bpy.utils.register_class(SPEEDLINES_OT_generate_modal)
+    bpy.utils.register_class(SPEEDLINES_OT_clear)
+    bpy.utils.register_class(SPEEDLINES_OT_bake)
+    bpy.utils.register_class(SPEEDLINES_OT_apply_controller)
+    bpy.utils.register_class(SPEEDLINES_PT_panel)
+    bpy.utils.register_class(SPEEDLINES_PT_cache_panel)
+    bpy.utils.register_class(SPEEDLINES_PT_profile_panel)
+    bpy.utils.register_class(SPEEDLINES_PT_control_panel)
+    bpy.types.Scene.speedlines_props = bpy.props.PointerProperty(type=SpeedLinesProperties)
+    bpy.app.handlers.depsgraph_update_post.append(speedlines_controller_update)
+    bpy.app.handlers.frame_change_pre.append(speedlines_stream_update)
+    bpy.app.handlers.frame_change_post.append(speedlines_stream_in)
+
+def unregister():
+    bpy.utils.unregister_class(SpeedLinesProperties)
+    bpy.utils.unregister_class(SPEEDLINES_OT_speed_preset)
+    bpy.utils.unregister_class(SPEEDLINES_OT_continuous_flow)
+    bpy.utils.unregister_class(SPEEDLINES_OT_generate)
+    bpy.utils.unregister_class(SPEEDLINES_OT_generate_modal)
+    bpy.utils.unregister_class(SPEEDLINES_OT_clear)
+    bpy.utils.unregister_class(SPEEDLINES_OT_bake)
+    bpy.utils.unregister_class(SPEEDLINES_OT_apply_controller)
+    bpy.utils.unregister_class(SPEEDLINES_PT_profile_panel)
+    bpy.utils.unregister_class(SPEEDLINES_PT_cache_panel)
+    bpy.utils.unregister_class(SPEEDLINES_PT_panel)
+    bpy.utils.unregister_class(SPEEDLINES_PT_control_panel)
+    del bpy.types.Scene.speedlines_props
+    if speedlines_controller_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(speedlines_controller_update)
+    if speedlines_stream_update in bpy.app.handlers.frame_change_pre:
+        bpy.app.handlers.frame_change_pre.remove(speedlines_stream_update)
+    if speedlines_stream_in in bpy.app.handlers.frame_change_post:
+        bpy.app.handlers.frame_change_post.remove(speedlines_stream_in)
+    _line_streams.clear()
+
+if __name__ == "__main__":
+    register()
\ No newline at end of file
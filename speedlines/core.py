@@ -0,0 +1,635 @@
+"""Line layout, timing and geometry math of the speed lines add-on, and its line cache files.
+
+Nothing in here imports bpy, so the math can be run, profiled and
+benchmarked in a plain Python process. Functions take a SpeedLinesConfig,
+or anything else with the same attributes such as the add-on's scene
+properties, and return NumPy arrays.
+"""
+import json
+import math
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+
+@dataclass
+class SpeedLinesConfig:
+    """The generation settings the line math reads, named and defaulted like SpeedLinesProperties"""
+    zone_center: tuple = (0.0, 0.0, 0.0)
+    zone_size: tuple = (10.0, 10.0, 5.0)
+    line_count: int = 250
+    line_length: float = 3.0
+    line_width: float = 0.05
+    line_type: str = 'TAPERED'
+    taper_factor: float = 0.1
+    animation_speed: float = 1.0
+    animation_duration: float = 400.0
+    flow_direction: tuple = (1.0, 0.0, 0.0)
+    spawn_randomness: float = 0.8
+    pattern: str = 'PARALLEL'
+    min_distance: float = 1.0
+    randomness: float = 0.2
+    seed: int = 0
+    
+    @classmethod
+    def from_properties(cls, props):
+        """Copy the settings from the add-on's scene properties or any object with the same attributes"""
+        values = {}
+        for field in fields(cls):
+            value = getattr(props, field.name, field.default)
+            values[field.name] = tuple(value) if isinstance(field.default, tuple) else value
+        return cls(**values)
+
+
+# Per-line layout arrays: positions and directions are (N, 3)
+LineLayout = namedtuple("LineLayout", "positions directions cycle_offsets spawn_delays")
+
+# Per-line motion arrays: spawn/exit positions are (N, 3), frames are (N,) integers
+LineMotion = namedtuple("LineMotion", "spawn_positions exit_positions start_frames end_frames")
+
+# Frames a line stays visible at its exit position before it is hidden
+LINGER_FRAMES = 10
+
+def normalize_rows(vectors):
+    """Normalize vectors along the last axis, zero vectors stay zero"""
+    vectors = np.asarray(vectors, dtype=np.float64)
+    lengths = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, lengths, out=np.zeros_like(vectors), where=lengths > 0)
+
+def perpendicular_basis(flow_direction):
+    """Two unit vectors spanning the cross-section of a normalized flow direction"""
+    if abs(flow_direction[2]) < 0.9:
+        perpendicular1 = normalize_rows((-flow_direction[1], flow_direction[0], 0.0))
+        perpendicular2 = normalize_rows(np.cross(flow_direction, perpendicular1))
+    else:
+        perpendicular1 = np.array((1.0, 0.0, 0.0))
+        perpendicular2 = np.array((0.0, 1.0, 0.0))
+    return perpendicular1, perpendicular2
+
+# Per-line random streams, one for each kind of random draw
+(STREAM_GRID_U, STREAM_GRID_V, STREAM_ANGLE, STREAM_ZONE_U, STREAM_ZONE_V,
+ STREAM_DIRECTION, STREAM_CYCLE_OFFSET, STREAM_SPAWN_DELAY, STREAM_SPAWN_JITTER,
+ STREAM_CULL_THIN, STREAM_VIEWPORT_DISPLAY) = range(11)
+
+def splitmix64(state):
+    """SplitMix64 finalizer, mixing every bit of a uint64 array into every other"""
+    state = state + np.uint64(0x9E3779B97F4A7C15)
+    state = (state ^ (state >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    state = (state ^ (state >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return state ^ (state >> np.uint64(31))
+
+def line_random(seed, indices, stream, draws=1):
+    """Uniform random numbers in [0, 1) for each line, shape (N,) or (N, draws).
+    
+    Every (seed, line index, stream, draw) combination is hashed on its
+    own, so any subset of lines can be computed in any order, or in
+    parallel, and gets exactly the numbers a full generation would.
+    """
+    indices = np.asarray(indices, dtype=np.uint64).reshape(-1, 1)
+    draw = np.arange(draws, dtype=np.uint64).reshape(1, -1)
+    with np.errstate(over='ignore'):
+        state = splitmix64(np.array([seed & 0xFFFFFFFFFFFFFFFF], dtype=np.uint64))
+        state = splitmix64(state ^ indices)
+        state = splitmix64(state ^ ((np.uint64(stream) << np.uint64(32)) | draw))
+    values = (state >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+    return values[:, 0] if draws == 1 else values
+
+def calculate_line_layout(config, indices):
+    """Calculate positions, flow directions and spawn delays for many lines at once"""
+    indices = np.asarray(indices, dtype=np.int64)
+    count = len(indices)
+    
+    def uniform(low, high, stream, draws=1):
+        return low + (high - low) * line_random(config.seed, indices, stream, draws)
+    
+    zone_center = np.array(config.zone_center, dtype=np.float64)
+    zone_extent = float(np.linalg.norm(config.zone_size))
+    flow_direction = normalize_rows(config.flow_direction)
+    randomness = config.randomness
+    
+    if config.pattern == 'PARALLEL':
+        perpendicular1, perpendicular2 = perpendicular_basis(flow_direction)
+        
+        # Distribute lines across the cross-section
+        grid_size = max(1, int(math.sqrt(config.line_count)))
+        row = indices // grid_size
+        col = indices % grid_size
+        
+        # Calculate position within the zone cross-section
+        if grid_size > 1:
+            u = row / (grid_size - 1) - 0.5
+            v = col / (grid_size - 1) - 0.5
+        else:
+            u = np.zeros(count)
+            v = np.zeros(count)
+        
+        # Add randomness
+        u = u + uniform(-randomness, randomness, STREAM_GRID_U) * 0.5
+        v = v + uniform(-randomness, randomness, STREAM_GRID_V) * 0.5
+        
+        positions = (zone_center +
+                     np.outer(u, perpendicular1) * zone_extent * 0.7 +
+                     np.outer(v, perpendicular2) * zone_extent * 0.7)
+        
+        # Flow direction stays the same for parallel
+        directions = np.tile(flow_direction, (count, 1))
+        
+    elif config.pattern == 'RADIAL':
+        # Radial pattern from center, flowing outward
+        angle = indices / config.line_count * 2 * math.pi
+        angle = angle + uniform(-randomness, randomness, STREAM_ANGLE)
+        
+        directions = np.column_stack((np.cos(angle), np.sin(angle), np.zeros(count)))
+        positions = zone_center + directions * config.min_distance
+        
+    else:  # RANDOM
+        perpendicular1, perpendicular2 = perpendicular_basis(flow_direction)
+        
+        u = uniform(-1, 1, STREAM_ZONE_U)
+        v = uniform(-1, 1, STREAM_ZONE_V)
+        
+        positions = (zone_center +
+                     np.outer(u, perpendicular1) * zone_extent * 0.4 +
+                     np.outer(v, perpendicular2) * zone_extent * 0.4)
+        
+        # Add slight random variation to flow direction
+        jitter = uniform(-1, 1, STREAM_DIRECTION, 3) * (np.array((0.3, 0.3, 0.1)) * randomness)
+        directions = normalize_rows(flow_direction + jitter)
+    
+    # Random phase and spawn time across extended time
+    cycle_offsets = uniform(0, 1, STREAM_CYCLE_OFFSET)
+    spawn_delays = line_spawn_delays(config, indices)
+    
+    return LineLayout(positions, directions, cycle_offsets, spawn_delays)
+
+def line_spawn_delays(config, indices):
+    """Spawn delays of lines, spread over twice the animation duration"""
+    return config.animation_duration * 2 * line_random(config.seed, indices, STREAM_SPAWN_DELAY)
+
+def calculate_line_motion_batch(config, positions, directions, spawn_delays, indices=None,
+                                random_spawn_delays=None):
+    """Calculate spawn/exit positions and frames for many lines at once.
+    
+    indices are the line indices the random spawn times are drawn for,
+    0..N-1 by default. random_spawn_delays replaces those random draws when
+    existing lines are retimed.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    directions = normalize_rows(directions)
+    spawn_delays = np.asarray(spawn_delays, dtype=np.float64)
+    zone_size = np.array(config.zone_size, dtype=np.float64)
+    
+    # Lines travel far behind and past the zone along their dominant axis
+    main_axis = np.argmax(np.abs(directions), axis=1)
+    half_distance = zone_size[main_axis] / 2 + config.line_length * 4
+    offsets = directions * half_distance[:, np.newaxis]
+    
+    # Animation timing for permanent motion with a random spawn time
+    travel_frames = int(config.animation_duration / config.animation_speed)
+    if random_spawn_delays is None:
+        max_spawn_delay = int(config.spawn_randomness * travel_frames)
+        if indices is None:
+            indices = np.arange(len(positions))
+        jitter = line_random(config.seed, indices, STREAM_SPAWN_JITTER)
+        random_spawn_delays = np.floor(jitter * (max_spawn_delay + 1)).astype(np.int64)
+    
+    start_frames = 1 + spawn_delays.astype(np.int64) + random_spawn_delays
+    end_frames = start_frames + travel_frames
+    
+    return LineMotion(positions - offsets, positions + offsets, start_frames, end_frames)
+
+# Lines per chunk of the parallel layout and geometry precompute
+LINE_CHUNK_SIZE = 4096
+
+def map_line_chunks(function, count, workers, chunk_size=LINE_CHUNK_SIZE):
+    """Results of function(start, stop) over consecutive chunks of count lines, in chunk order.
+    
+    Chunks run on a thread pool when workers > 1, NumPy releases the GIL
+    inside the vectorized math.
+    """
+    bounds = [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+    if workers <= 1 or len(bounds) <= 1:
+        return [function(start, stop) for start, stop in bounds]
+    with ThreadPoolExecutor(max_workers=min(workers, len(bounds))) as pool:
+        return list(pool.map(lambda chunk: function(*chunk), bounds))
+
+def calculate_lines(config, indices, workers=1):
+    """Layout and motion of many lines, computed in chunks on worker threads.
+    
+    Every line only depends on the seed and its own index, so the joined
+    chunks match a single pass over all lines exactly.
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    if workers > 1 and not isinstance(config, SpeedLinesConfig):
+        # Worker threads read a plain copy of the settings
+        config = SpeedLinesConfig.from_properties(config)
+    
+    def chunk(start, stop):
+        layout = calculate_line_layout(config, indices[start:stop])
+        motion = calculate_line_motion_batch(config, layout.positions, layout.directions,
+                                             layout.spawn_delays, indices[start:stop])
+        return layout, motion
+    
+    chunks = map_line_chunks(chunk, len(indices), workers)
+    if not chunks:
+        return chunk(0, 0)
+    return (LineLayout(*(np.concatenate(values) for values in zip(*(layout for layout, _ in chunks)))),
+            LineMotion(*(np.concatenate(values) for values in zip(*(motion for _, motion in chunks)))))
+
+def retime_line_motion(config, layout, indices):
+    """Layout and motion of existing lines for new timing settings.
+    
+    Only the spawn delays of a layout depend on the timing, they are drawn
+    again for the line indices so the result matches calculate_lines.
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    layout = layout._replace(spawn_delays=line_spawn_delays(config, indices))
+    motion = calculate_line_motion_batch(config, layout.positions, layout.directions,
+                                         layout.spawn_delays, indices)
+    return layout, motion
+
+def subset_lines(layout, motion, rows):
+    """Layout and motion of only some of the lines"""
+    return (LineLayout(*(np.asarray(values)[rows] for values in layout)),
+            LineMotion(*(np.asarray(values)[rows] for values in motion)))
+
+def lines_in_window(motion, first, last):
+    """Indices of the lines visible on at least one frame from first to last"""
+    hidden_frames = np.asarray(motion.end_frames) + LINGER_FRAMES
+    return np.nonzero((np.asarray(motion.start_frames) <= last) & (hidden_frames > first))[0]
+
+def loop_period(frame_start, frame_end, travel_frames):
+    """Loop period and travel frames for a seamless loop over a frame range.
+    
+    The period is the shortest one that divides the range and still leaves
+    every line hidden for a frame. Lines travel faster when even the whole
+    range is too short for that.
+    """
+    length = frame_end - frame_start + 1
+    shortest = travel_frames + LINGER_FRAMES + 1
+    for period in range(shortest, length + 1):
+        if length % period == 0:
+            return period, travel_frames
+    return length, max(1, length - LINGER_FRAMES - 1)
+
+def loop_line_motion(motion, cycle_offsets, frame_start, frame_end):
+    """Time every line to spawn once per loop period, at a phase from its cycle offset.
+    
+    Returns the motion during the first period and the (loop_start, period) it repeats with.
+    """
+    travel = int(motion.end_frames[0] - motion.start_frames[0]) if len(motion.end_frames) else 1
+    period, travel = loop_period(frame_start, frame_end, travel)
+    start_frames = frame_start + np.floor(np.asarray(cycle_offsets) * period).astype(np.int64)
+    looped = LineMotion(motion.spawn_positions, motion.exit_positions, start_frames, start_frames + travel)
+    return looped, (frame_start, period)
+
+def repeat_loop_motion(motion, loop, frame_end):
+    """The motion of every repeat of looping lines up to a frame, stacked repeat by repeat.
+    
+    Starts with the repeat before the loop start, whose lines are still
+    visible when the loop begins. Returns the stacked motion and the number
+    of repeats.
+    """
+    loop_start, period = loop
+    offsets = np.arange(-1, -(-(frame_end - loop_start + 1) // period)) * period
+    start_frames = np.asarray(motion.start_frames)[np.newaxis, :] + offsets[:, np.newaxis]
+    end_frames = np.asarray(motion.end_frames)[np.newaxis, :] + offsets[:, np.newaxis]
+    repeated = LineMotion(np.tile(motion.spawn_positions, (len(offsets), 1)),
+                          np.tile(motion.exit_positions, (len(offsets), 1)),
+                          start_frames.ravel(), end_frames.ravel())
+    return repeated, len(offsets)
+
+def segments_in_frustum(planes, starts, ends, margins):
+    """Whether each segment from start to end gets within its margin of the frustum"""
+    t_min = np.zeros(len(starts))
+    t_max = np.ones(len(starts))
+    inside = np.ones(len(starts), dtype=bool)
+    for plane in planes:
+        start_distance = starts @ plane[:3] + plane[3] + margins
+        end_distance = ends @ plane[:3] + plane[3] + margins
+        inside &= (start_distance >= 0) | (end_distance >= 0)
+        
+        # Clip the part of the segment behind the plane away
+        crossing = np.divide(start_distance, start_distance - end_distance,
+                             out=np.zeros(len(starts)), where=start_distance != end_distance)
+        t_min = np.where(start_distance < 0, np.maximum(t_min, crossing), t_min)
+        t_max = np.where(end_distance < 0, np.minimum(t_max, crossing), t_max)
+    return inside & (t_min <= t_max)
+
+def rotation_between(source, target):
+    """Rotation matrix turning one direction onto another along the shortest arc"""
+    source = normalize_rows(source)
+    target = normalize_rows(target)
+    if not source.any() or not target.any():
+        return np.eye(3)
+    
+    axis = np.cross(source, target)
+    sine_squared = float(axis @ axis)
+    cosine = float(source @ target)
+    if sine_squared <= 1e-12:
+        if cosine > 0:
+            return np.eye(3)
+        # Opposite directions: half turn around any perpendicular axis
+        perpendicular = perpendicular_basis(source)[0]
+        return 2 * np.outer(perpendicular, perpendicular) - np.eye(3)
+    
+    skew = np.array(((0.0, -axis[2], axis[1]),
+                     (axis[2], 0.0, -axis[0]),
+                     (-axis[1], axis[0], 0.0)))
+    return np.eye(3) + skew + skew @ skew * ((1 - cosine) / sine_squared)
+
+def retime_lines(settings, old_settings, positions, directions, start_frames, spawn_delays,
+                 cycle_offsets):
+    """Move and retime existing lines from old_settings to settings, for all lines at once.
+    
+    Each line keeps its relative place in the spawn window, and the whole
+    layout turns around the zone center with the flow direction, except for
+    the radial pattern that doesn't follow it. Returns the
+    new positions, directions and spawn delays plus the new LineMotion.
+    """
+    old_travel = int(old_settings.animation_duration / old_settings.animation_speed)
+    old_max_spawn_delay = int(old_settings.spawn_randomness * old_travel)
+    new_travel = int(settings.animation_duration / settings.animation_speed)
+    new_max_spawn_delay = int(settings.spawn_randomness * new_travel)
+    
+    # Recover where each line sat in its random spawn window
+    spawn_delays = np.asarray(spawn_delays, dtype=np.float64)
+    random_spawn_delays = np.asarray(start_frames) - 1 - spawn_delays.astype(np.int64)
+    if old_max_spawn_delay > 0:
+        window_position = np.clip(random_spawn_delays / old_max_spawn_delay, 0.0, 1.0)
+    else:
+        window_position = np.asarray(cycle_offsets, dtype=np.float64)
+    
+    # Spawn delays are spread over twice the animation duration
+    spawn_delays = spawn_delays * (settings.animation_duration / old_settings.animation_duration)
+    random_spawn_delays = np.rint(window_position * new_max_spawn_delay).astype(np.int64)
+    
+    if settings.pattern == 'RADIAL':
+        # Radial lines fan out in the XY plane whatever the flow direction
+        rotation = np.eye(3)
+    else:
+        rotation = rotation_between(old_settings.flow_direction, settings.flow_direction)
+    zone_center = np.array(settings.zone_center, dtype=np.float64)
+    positions = zone_center + (np.asarray(positions, dtype=np.float64) - zone_center) @ rotation.T
+    directions = normalize_rows(directions) @ rotation.T
+    
+    motion = calculate_line_motion_batch(settings, positions, directions, spawn_delays,
+                                         random_spawn_delays=random_spawn_delays)
+    return positions, directions, spawn_delays, motion
+
+# Line geometry as flat arrays: vertices (V, 3), loose edges (E, 2), face sizes (F,)
+# and face vertex indices (sum of face sizes,)
+LineGeometry = namedtuple("LineGeometry", "vertices edges face_sizes face_vertices")
+
+def simple_line_geometry(length):
+    """A single edge along the X-axis"""
+    vertices = np.array(((-length / 2, 0.0, 0.0), (length / 2, 0.0, 0.0)))
+    return LineGeometry(vertices, np.array(((0, 1),)), np.zeros(0, dtype=np.int64),
+                        np.zeros(0, dtype=np.int64))
+
+def tapered_line_geometry(length, width, taper_factor):
+    """A tapered quad along the X-axis"""
+    vertices = np.array((
+        (-length / 2, -width, 0.0),                  # Start bottom
+        (-length / 2, width, 0.0),                   # Start top
+        (length / 2, width * taper_factor, 0.0),     # End top (tapered)
+        (length / 2, -width * taper_factor, 0.0),    # End bottom (tapered)
+    ))
+    return LineGeometry(vertices, np.zeros((0, 2), dtype=np.int64), np.array((4,)),
+                        np.arange(4))
+
+def tube_line_geometry(length, width, taper_factor, segments=8):
+    """A capped cylinder along the X-axis, tapering towards +X"""
+    angles = np.arange(segments) * (2 * math.pi / segments)
+    ring = np.column_stack((np.cos(angles), np.sin(angles)))
+    start_ring = np.column_stack((np.full(segments, -length / 2), ring * width))
+    end_ring = np.column_stack((np.full(segments, length / 2), ring * width * taper_factor))
+    vertices = np.concatenate((start_ring, end_ring))
+    
+    # Side quads wind outward, the start cap faces -X and the end cap +X
+    current = np.arange(segments)
+    following = (current + 1) % segments
+    sides = np.column_stack((current, following, following + segments, current + segments))
+    start_cap = current[::-1]
+    end_cap = current + segments
+    
+    face_sizes = np.concatenate((np.full(segments, 4), (segments, segments)))
+    face_vertices = np.concatenate((sides.ravel(), start_cap, end_cap))
+    return LineGeometry(vertices, np.zeros((0, 2), dtype=np.int64), face_sizes, face_vertices)
+
+def line_geometry(config):
+    """Geometry of one line of the current type in standard orientation (along X-axis)"""
+    if config.line_type == 'SIMPLE':
+        return simple_line_geometry(config.line_length)
+    if config.line_type == 'TUBE':
+        return tube_line_geometry(config.line_length, config.line_width, config.taper_factor)
+    return tapered_line_geometry(config.line_length, config.line_width, config.taper_factor)
+
+def rotation_matrices_from_x(directions):
+    """Rotation matrices turning the X-axis onto each direction along the shortest arc"""
+    directions = normalize_rows(directions)
+    count = len(directions)
+    
+    # Rodrigues' formula around axis = X cross direction
+    axis = np.column_stack((np.zeros(count), -directions[:, 2], directions[:, 1]))
+    sine_squared = np.einsum("ij,ij->i", axis, axis)
+    cosine = directions[:, 0]
+    
+    skew = np.zeros((count, 3, 3))
+    skew[:, 0, 1] = -axis[:, 2]
+    skew[:, 0, 2] = axis[:, 1]
+    skew[:, 1, 0] = axis[:, 2]
+    skew[:, 1, 2] = -axis[:, 0]
+    skew[:, 2, 0] = -axis[:, 1]
+    skew[:, 2, 1] = axis[:, 0]
+    
+    factor = np.divide(1 - cosine, sine_squared, out=np.zeros(count), where=sine_squared > 1e-12)
+    matrices = np.eye(3) + skew + (skew @ skew) * factor[:, np.newaxis, np.newaxis]
+    
+    # Directions pointing along -X turn half way around Z
+    opposite = (sine_squared <= 1e-12) & (cosine < 0)
+    matrices[opposite] = np.diag((-1.0, -1.0, 1.0))
+    return matrices
+
+def place_line_vertices(geometry, positions, directions):
+    """Vertices of one copy of the line geometry per line, shape (N * V, 3)"""
+    matrices = rotation_matrices_from_x(directions)
+    vertices = np.einsum("nij,vj->nvi", matrices, geometry.vertices)
+    vertices += np.asarray(positions, dtype=np.float64)[:, np.newaxis, :]
+    return vertices.reshape(-1, 3)
+
+def merge_line_geometry(geometry, positions, directions, workers=1):
+    """Place one copy of the line geometry per line and merge them into one set of arrays.
+    
+    Returns the merged geometry and the line id of every merged vertex.
+    With workers > 1 the vertices are placed in chunks on worker threads.
+    """
+    count = len(positions)
+    vertex_count = len(geometry.vertices)
+    
+    chunks = map_line_chunks(
+        lambda start, stop: place_line_vertices(geometry, positions[start:stop], directions[start:stop]),
+        count, workers)
+    vertices = np.concatenate(chunks) if chunks else np.zeros((0, 3))
+    
+    vertex_offsets = (np.arange(count) * vertex_count)[:, np.newaxis]
+    edges = (geometry.edges.reshape(1, -1) + vertex_offsets).reshape(-1, 2)
+    face_vertices = (geometry.face_vertices.reshape(1, -1) + vertex_offsets).ravel()
+    face_sizes = np.tile(geometry.face_sizes, count)
+    
+    merged = LineGeometry(vertices, edges, face_sizes, face_vertices)
+    return merged, np.repeat(np.arange(count), vertex_count)
+
+# Level-of-detail variants from finest to coarsest as (line type, tube segments),
+# the triangles one line of each has and the projected width in pixels it is used from
+LOD_LEVELS = (('TUBE', 8), ('TUBE', 6), ('TUBE', 4), ('TAPERED', 0), ('SIMPLE', 0))
+LOD_TRIANGLES = np.array((28, 20, 12, 2, 0))
+LOD_MIN_PIXELS = np.array((12.0, 6.0, 3.0, 1.0, 0.0))
+
+# Coarsest level lines still render with, SIMPLE lines are bare edges that renders skip
+LOD_RENDERED_LEVEL = 3
+
+def base_lod_level(line_type):
+    """The finest level of detail a line type is generated with"""
+    return next(level for level, (variant, _) in enumerate(LOD_LEVELS) if variant == line_type)
+
+def lod_geometry(config, level):
+    """Geometry of one line at a level of detail"""
+    line_type, segments = LOD_LEVELS[level]
+    if line_type == 'SIMPLE':
+        return simple_line_geometry(config.line_length)
+    if line_type == 'TUBE':
+        return tube_line_geometry(config.line_length, config.line_width, config.taper_factor, segments)
+    return tapered_line_geometry(config.line_length, config.line_width, config.taper_factor)
+
+def segment_depths(origin, forward, starts, ends, near=1e-3):
+    """Smallest depth in front of a camera that each segment from start to end gets to"""
+    origin = np.asarray(origin, dtype=np.float64)
+    forward = normalize_rows(forward)
+    start_depths = (np.asarray(starts, dtype=np.float64) - origin) @ forward
+    end_depths = (np.asarray(ends, dtype=np.float64) - origin) @ forward
+    return np.maximum(np.minimum(start_depths, end_depths), near)
+
+def lod_levels(widths, line_type):
+    """Level of detail of each line from its projected width in pixels, never coarser than renders show"""
+    levels = np.argmax(np.asarray(widths)[:, np.newaxis] >= LOD_MIN_PIXELS, axis=1)
+    base = base_lod_level(line_type)
+    return np.maximum(np.minimum(levels, max(LOD_RENDERED_LEVEL, base)), base)
+
+def apply_triangle_budget(levels, widths, budget):
+    """Coarsen lines until all of them together have at most budget triangles.
+    
+    Each pass lowers lines by one level, those smallest on screen first,
+    and stops as soon as the budget is met. Lines are never coarsened past
+    LOD_RENDERED_LEVEL, so the budget is exceeded rather than lines
+    disappearing from renders. Returns the new levels.
+    """
+    levels = np.array(levels)
+    order = np.argsort(widths, kind="stable")
+    coarsest = LOD_RENDERED_LEVEL
+    excess = int(LOD_TRIANGLES[levels].sum()) - budget
+    while excess > 0:
+        candidates = order[levels[order] < coarsest]
+        if not len(candidates):
+            break
+        savings = LOD_TRIANGLES[levels[candidates]] - LOD_TRIANGLES[levels[candidates] + 1]
+        needed = int(np.searchsorted(np.cumsum(savings), excess)) + 1
+        levels[candidates[:needed]] += 1
+        excess -= int(savings[:needed].sum())
+    return levels
+
+def merge_lod_geometry(config, levels, positions, directions, workers=1):
+    """Merge lines of mixed levels of detail into one set of arrays.
+    
+    Returns the merged geometry and the row of every merged vertex in
+    positions, like merge_line_geometry.
+    """
+    parts = []
+    vertex_offset = 0
+    for level in np.unique(levels):
+        rows = np.nonzero(levels == level)[0]
+        merged, line_ids = merge_line_geometry(lod_geometry(config, level), positions[rows],
+                                               directions[rows], workers)
+        parts.append((merged._replace(edges=merged.edges + vertex_offset,
+                                      face_vertices=merged.face_vertices + vertex_offset), rows[line_ids]))
+        vertex_offset += len(merged.vertices)
+    
+    if not parts:
+        return merge_line_geometry(lod_geometry(config, 0), positions, directions)
+    geometry = LineGeometry(*(np.concatenate(values) for values in zip(*(part for part, _ in parts))))
+    return geometry, np.concatenate([line_ids for _, line_ids in parts])
+
+# Line cache file layout: magic, format version, JSON header length, JSON header,
+# then every array as raw C-ordered data aligned to CACHE_ALIGNMENT bytes
+CACHE_MAGIC = b"SPDLNCCH"
+CACHE_VERSION = 1
+CACHE_ALIGNMENT = 64
+
+def align_offset(offset):
+    """Round a file offset up to the cache alignment"""
+    return -(-offset // CACHE_ALIGNMENT) * CACHE_ALIGNMENT
+
+def write_line_cache(path, header, arrays):
+    """Write a dict of NumPy arrays to a cache file"""
+    entries = {}
+    offset = 0
+    for name, array in arrays.items():
+        offset = align_offset(offset)
+        entries[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += array.nbytes
+    
+    header = dict(header, arrays=entries)
+    header_bytes = json.dumps(header).encode()
+    prefix = CACHE_MAGIC + np.array((CACHE_VERSION, len(header_bytes)), dtype="<u4").tobytes()
+    data_start = align_offset(len(prefix) + len(header_bytes))
+    
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(prefix + header_bytes)
+        for name, array in arrays.items():
+            file.write(b"\0" * (data_start + entries[name]["offset"] - file.tell()))
+            file.write(np.ascontiguousarray(array).tobytes())
+    # Readers never see a half written cache
+    os.replace(temp_path, path)
+    return header
+
+def read_line_cache(path, key=None):
+    """Memory-map a cache file, returns its header and arrays.
+    
+    The arrays are copy-on-write maps of the file, pages are only read
+    when they are used. Raises ValueError for files that aren't complete
+    caches, or were baked for another key when one is given.
+    """
+    with open(path, "rb") as file:
+        prefix = file.read(len(CACHE_MAGIC) + 8)
+        if len(prefix) < len(CACHE_MAGIC) + 8 or prefix[:len(CACHE_MAGIC)] != CACHE_MAGIC:
+            raise ValueError(f"{path} is not a speed lines cache")
+        version, header_length = np.frombuffer(prefix[len(CACHE_MAGIC):], dtype="<u4")
+        if version != CACHE_VERSION:
+            raise ValueError(f"Unsupported speed lines cache version {version}")
+        header_bytes = file.read(int(header_length))
+        if len(header_bytes) < header_length:
+            raise ValueError(f"{path} is truncated")
+        header = json.loads(header_bytes)
+        file_size = os.fstat(file.fileno()).st_size
+    
+    if key is not None and header.get("key") != key:
+        raise ValueError(f"{path} was baked for other parameters")
+    
+    data_start = align_offset(len(prefix) + int(header_length))
+    arrays = {}
+    for name, entry in header["arrays"].items():
+        shape = tuple(entry["shape"])
+        size = np.dtype(entry["dtype"]).itemsize * int(np.prod(shape))
+        if data_start + entry["offset"] + size > file_size:
+            raise ValueError(f"{path} is truncated")
+        if 0 in shape:
+            arrays[name] = np.zeros(shape, dtype=entry["dtype"])
+        else:
+            arrays[name] = np.memmap(path, dtype=entry["dtype"], mode='c',
+                                     offset=data_start + entry["offset"], shape=shape)
+    return header, arrays
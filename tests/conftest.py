@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The core module is imported on its own, the package __init__ needs Blender
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "speedlines"))
@@ -0,0 +1,214 @@
+"""Tests of the bpy-free line math, run with plain CPython: python -m pytest tests"""
+import numpy as np
+import pytest
+
+import core
+from core import LineMotion, SpeedLinesConfig
+
+
+PATTERNS = ('PARALLEL', 'RADIAL', 'RANDOM')
+
+
+def cube_planes(half_size=1.0):
+    """Frustum planes of an axis-aligned cube around the origin, normals pointing inwards"""
+    planes = []
+    for axis in range(3):
+        for sign in (1.0, -1.0):
+            normal = np.zeros(3)
+            normal[axis] = sign
+            planes.append((*normal, half_size))
+    return np.array(planes)
+
+
+def test_line_random_in_unit_interval():
+    values = core.line_random(7, np.arange(10000), core.STREAM_ZONE_U)
+    assert values.shape == (10000,)
+    assert values.min() >= 0.0 and values.max() < 1.0
+    assert abs(values.mean() - 0.5) < 0.01
+
+
+def test_line_random_depends_only_on_seed_index_and_stream():
+    values = core.line_random(3, np.arange(100), core.STREAM_ANGLE, draws=3)
+    assert values.shape == (100, 3)
+    subset = core.line_random(3, [42, 7], core.STREAM_ANGLE, draws=3)
+    assert np.array_equal(subset, values[[42, 7]])
+    assert not np.array_equal(values, core.line_random(4, np.arange(100), core.STREAM_ANGLE, draws=3))
+    assert not np.array_equal(values[:, 0], core.line_random(3, np.arange(100), core.STREAM_ZONE_U))
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_line_layout_shapes_and_units(pattern):
+    config = SpeedLinesConfig(line_count=200, pattern=pattern, seed=5)
+    layout = core.calculate_line_layout(config, np.arange(200))
+    assert layout.positions.shape == (200, 3)
+    assert layout.directions.shape == (200, 3)
+    assert np.allclose(np.linalg.norm(layout.directions, axis=1), 1.0)
+    assert np.all((layout.cycle_offsets >= 0) & (layout.cycle_offsets < 1))
+    assert np.all((layout.spawn_delays >= 0) & (layout.spawn_delays < 2 * config.animation_duration))
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_line_layout_of_a_subset_matches_the_full_layout(pattern):
+    config = SpeedLinesConfig(line_count=300, pattern=pattern, seed=11)
+    full = core.calculate_line_layout(config, np.arange(300))
+    rows = np.array([299, 3, 150, 0])
+    subset = core.calculate_line_layout(config, rows)
+    for full_values, subset_values in zip(full, subset):
+        assert np.allclose(full_values[rows], subset_values)
+
+
+def test_parallel_lines_follow_the_flow_direction():
+    config = SpeedLinesConfig(line_count=50, pattern='PARALLEL', flow_direction=(0.0, 2.0, 0.0))
+    layout = core.calculate_line_layout(config, np.arange(50))
+    assert np.allclose(layout.directions, (0.0, 1.0, 0.0))
+
+
+def test_line_motion_travels_through_the_base_position():
+    config = SpeedLinesConfig(line_count=100, pattern='RANDOM', seed=2)
+    layout = core.calculate_line_layout(config, np.arange(100))
+    motion = core.calculate_line_motion_batch(config, layout.positions, layout.directions, layout.spawn_delays)
+    
+    assert np.allclose((motion.spawn_positions + motion.exit_positions) / 2, layout.positions)
+    travel = int(config.animation_duration / config.animation_speed)
+    assert np.all(motion.end_frames - motion.start_frames == travel)
+    # Spawns are delayed by the spawn delay plus at most spawn_randomness of the travel time
+    jitter = motion.start_frames - 1 - layout.spawn_delays.astype(np.int64)
+    assert np.all((jitter >= 0) & (jitter <= int(config.spawn_randomness * travel)))
+
+
+def test_line_motion_uses_given_spawn_delays():
+    config = SpeedLinesConfig()
+    positions = np.zeros((3, 3))
+    directions = np.tile((1.0, 0.0, 0.0), (3, 1))
+    motion = core.calculate_line_motion_batch(config, positions, directions, np.array((0.0, 10.0, 20.5)),
+                                              random_spawn_delays=np.array((5, 0, 1)))
+    assert list(motion.start_frames) == [6, 11, 22]
+
+
+def test_chunked_lines_match_a_single_pass():
+    config = SpeedLinesConfig(line_count=10000, pattern='RANDOM', seed=9)
+    indices = np.arange(config.line_count)
+    single = core.calculate_lines(config, indices)
+    threaded = core.calculate_lines(config, indices, workers=4)
+    for single_values, threaded_values in zip(single[0] + single[1], threaded[0] + threaded[1]):
+        assert np.array_equal(single_values, threaded_values)
+
+
+def test_count_and_timing_update_matches_a_fresh_generation():
+    old = SpeedLinesConfig(line_count=100, pattern='RANDOM', seed=6, animation_duration=400.0)
+    new = SpeedLinesConfig(line_count=150, pattern='RANDOM', seed=6, animation_duration=300.0,
+                           animation_speed=1.5, spawn_randomness=0.5)
+    existing_layout, _ = core.calculate_lines(old, np.arange(old.line_count))
+    
+    # Retime the existing lines, then append the new ones
+    layout, motion = core.retime_line_motion(new, existing_layout, np.arange(old.line_count))
+    appended_layout, appended_motion = core.calculate_lines(new, np.arange(old.line_count, new.line_count))
+    fresh_layout, fresh_motion = core.calculate_lines(new, np.arange(new.line_count))
+    
+    for values, appended, fresh in zip(layout + motion, appended_layout + appended_motion,
+                                       fresh_layout + fresh_motion):
+        assert np.array_equal(np.concatenate((values, appended)), fresh)
+
+
+def test_loop_line_motion_spawns_every_line_in_the_first_period():
+    config = SpeedLinesConfig(line_count=500, seed=4, animation_duration=60.0)
+    layout, motion = core.calculate_lines(config, np.arange(config.line_count))
+    looped, (loop_start, period) = core.loop_line_motion(motion, layout.cycle_offsets, 1, 240)
+    
+    assert loop_start == 1
+    assert 240 % period == 0
+    travel = looped.end_frames - looped.start_frames
+    # Every line is hidden for at least a frame of each period
+    assert np.all(travel + core.LINGER_FRAMES < period)
+    assert np.all((looped.start_frames >= 1) & (looped.start_frames < 1 + period))
+    assert np.array_equal(looped.spawn_positions, motion.spawn_positions)
+
+
+def test_loop_line_motion_speeds_lines_up_in_a_short_range():
+    motion = LineMotion(np.zeros((2, 3)), np.ones((2, 3)), np.array((1, 5)), np.array((101, 105)))
+    looped, (_, period) = core.loop_line_motion(motion, np.array((0.0, 0.5)), 1, 30)
+    assert period == 30
+    assert np.all(looped.end_frames - looped.start_frames == 30 - core.LINGER_FRAMES - 1)
+
+
+def test_retimed_radial_lines_match_a_fresh_layout():
+    old = SpeedLinesConfig(line_count=120, pattern='RADIAL', seed=8)
+    new = SpeedLinesConfig(line_count=120, pattern='RADIAL', seed=8, flow_direction=(0.0, 0.6, 0.8),
+                           animation_duration=250.0)
+    layout, motion = core.calculate_lines(old, np.arange(old.line_count))
+    positions, directions, spawn_delays, _ = core.retime_lines(
+        new, old, layout.positions, layout.directions, motion.start_frames, layout.spawn_delays,
+        layout.cycle_offsets)
+    
+    fresh = core.calculate_line_layout(new, np.arange(new.line_count))
+    assert np.allclose(positions, fresh.positions)
+    assert np.allclose(directions, fresh.directions)
+    assert np.allclose(spawn_delays, fresh.spawn_delays)
+
+
+def test_segments_in_frustum():
+    planes = cube_planes()
+    starts = np.array(((0.0, 0.0, 0.0), (5.0, 0.0, 0.0), (-5.0, 0.0, 0.0), (5.0, 5.0, 0.0), (1.5, 0.0, 0.0)))
+    ends = np.array(((0.5, 0.0, 0.0), (6.0, 0.0, 0.0), (5.0, 0.0, 0.0), (5.0, -5.0, 0.0), (2.0, 0.0, 0.0)))
+    margins = np.zeros(5)
+    # Inside, beside the cube, crossing it, crossing the planes only outside it, close by
+    assert list(core.segments_in_frustum(planes, starts, ends, margins)) == [True, False, True, False, False]
+    margins[4] = 0.6
+    assert core.segments_in_frustum(planes, starts, ends, margins)[4]
+
+
+def test_line_cache_round_trip(tmp_path):
+    config = SpeedLinesConfig(line_count=1000, pattern='RANDOM', seed=12)
+    layout, motion = core.calculate_lines(config, np.arange(config.line_count))
+    arrays = dict(zip(core.LineLayout._fields, layout))
+    arrays.update(zip(core.LineMotion._fields, motion))
+    arrays["empty"] = np.zeros((0, 3))
+    path = str(tmp_path / "cache" / "lines.slc")
+    core.write_line_cache(path, {"key": "abc", "line_count": config.line_count}, arrays)
+    
+    header, loaded = core.read_line_cache(path, "abc")
+    assert header["key"] == "abc" and header["line_count"] == config.line_count
+    assert set(loaded) == set(arrays)
+    for name, array in arrays.items():
+        assert loaded[name].dtype == array.dtype
+        assert np.array_equal(loaded[name], array)
+    # Arrays start on aligned offsets of the file
+    assert all(entry["offset"] % core.CACHE_ALIGNMENT == 0 for entry in header["arrays"].values())
+
+
+def test_line_cache_rejects_other_keys_and_broken_files(tmp_path):
+    path = str(tmp_path / "lines.slc")
+    core.write_line_cache(path, {"key": "abc"}, {"values": np.arange(500.0)})
+    with pytest.raises(ValueError):
+        core.read_line_cache(path, "other")
+    
+    data = open(path, "rb").read()
+    for broken in (data[:-8], data[:20], b"not a cache"):
+        with open(path, "wb") as file:
+            file.write(broken)
+        with pytest.raises(ValueError):
+            core.read_line_cache(path)
+
+
+def test_triangle_budget_coarsens_smallest_lines_first():
+    levels = np.zeros(10, dtype=np.int64)
+    widths = np.arange(10.0)[::-1]
+    budget = int(core.LOD_TRIANGLES[0] * 10) - 20
+    coarsened = core.apply_triangle_budget(levels, widths, budget)
+    
+    assert core.LOD_TRIANGLES[coarsened].sum() <= budget
+    # The narrowest line loses detail first
+    assert coarsened[-1] > 0
+    assert coarsened[0] == 0
+
+
+def test_triangle_budget_never_drops_lines_below_rendered_level():
+    levels = np.zeros(10, dtype=np.int64)
+    coarsened = core.apply_triangle_budget(levels, np.arange(10.0), 0)
+    assert np.all(coarsened == core.LOD_RENDERED_LEVEL)
+    assert core.LOD_TRIANGLES[core.LOD_RENDERED_LEVEL] > 0
+
+
+def test_triangle_budget_keeps_lines_that_already_fit():
+    levels = np.array((0, 1, 2))
+    assert np.array_equal(core.apply_triangle_budget(levels, np.ones(3), 1000), levels)
@@ -0,0 +1,259 @@
+"""Generate many speed line configurations in parallel headless Blender workers.
+
+Run with a plain Python, Blender is started once per job:
+    
+    python tools/batch_generate.py jobs.json --output-dir variants --jobs 8
+
+The job file is JSON, or TOML with Python 3.11+. It holds either a list of
+jobs or a table with "defaults" merged into every job and a "jobs" list:
+    
+    {
+        "defaults": {"blend": "shots/base.blend", "props": {"line_type": "TUBE"}},
+        "jobs": [
+            {"name": "fast_radial", "preset": "FAST", "props": {"pattern": "RADIAL", "seed": 3}},
+            {"name": "flow_long", "continuous_flow": true, "frame_range": [1, 480], "bake": true}
+        ]
+    }
+
+Each job opens its blend file (or the factory startup scene), applies the
+speed preset, the continuous flow setup and then the props in that order,
+generates the speed lines and saves <output-dir>/<name>.blend. With
+"bake": true the line cache is baked into <output-dir>/cache first and the
+lines are generated from it, and "save": false skips the blend file.
+
+Every worker writes its log to <output-dir>/logs/<name>.log. The timing and
+outcome of every job is collected into <output-dir>/batch_report.json, and
+the script exits with status 1 when any job failed.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+ADDON_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Lines of a failed worker's log repeated in the report
+LOG_TAIL_LINES = 20
+
+
+def load_jobs(path):
+    """Jobs of a JSON or TOML job file, each merged onto the file's defaults"""
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:
+            sys.exit("TOML job files need Python 3.11 or newer, use JSON instead")
+        with open(path, "rb") as file:
+            data = tomllib.load(file)
+    else:
+        with open(path) as file:
+            data = json.load(file)
+    
+    if isinstance(data, list):
+        data = {"jobs": data}
+    defaults = data.get("defaults", {})
+    
+    jobs = []
+    names = set()
+    for number, job in enumerate(data.get("jobs", [])):
+        merged = dict(defaults, **job)
+        merged["props"] = dict(defaults.get("props", {}), **job.get("props", {}))
+        merged.setdefault("name", f"job_{number:03d}")
+        if merged["name"] in names:
+            sys.exit(f"Job name {merged['name']!r} is used more than once")
+        names.add(merged["name"])
+        if merged.get("blend"):
+            # Blend files are relative to the job file
+            merged["blend"] = os.path.join(os.path.dirname(os.path.abspath(path)), merged["blend"])
+        jobs.append(merged)
+    return jobs
+
+
+def log_tail(path):
+    """The last lines of a worker log"""
+    try:
+        with open(path, errors="replace") as file:
+            return file.read().splitlines()[-LOG_TAIL_LINES:]
+    except OSError:
+        return []
+
+
+def run_job(job, args):
+    """Run one job in its own Blender process and return its report entry"""
+    name = job["name"]
+    log_path = os.path.join(args.output_dir, "logs", f"{name}.log")
+    job = dict(job, output_dir=os.path.abspath(args.output_dir))
+    job["props"].setdefault("worker_threads", args.worker_threads)
+    
+    with tempfile.TemporaryDirectory(prefix="speedlines_batch_") as directory:
+        job_path = os.path.join(directory, "job.json")
+        result_path = os.path.join(directory, "result.json")
+        with open(job_path, "w") as file:
+            json.dump(job, file)
+        
+        command = [args.blender, "-b"]
+        if job.get("blend"):
+            command.append(job["blend"])
+        else:
+            command.append("--factory-startup")
+        if args.blender_threads:
+            command += ["-t", str(args.blender_threads)]
+        command += ["--python-exit-code", "1", "--python", os.path.abspath(__file__),
+                    "--", "--worker", job_path, "--result", result_path]
+        
+        start = time.perf_counter()
+        try:
+            with open(log_path, "w") as log:
+                returncode = subprocess.run(command, stdout=log, stderr=subprocess.STDOUT,
+                                            timeout=args.timeout).returncode
+            error = None if returncode == 0 else f"Blender exited with status {returncode}"
+        except subprocess.TimeoutExpired:
+            error = f"timed out after {args.timeout} s"
+        except OSError as e:
+            error = f"could not start Blender: {e}"
+        wall_time = time.perf_counter() - start
+        
+        result = {}
+        if os.path.exists(result_path):
+            with open(result_path) as file:
+                result = json.load(file)
+    
+    report = {"name": name, "wall_time": wall_time, "log": log_path}
+    report.update(result)
+    if error and "error" not in report:
+        report["error"] = error
+    report["ok"] = bool(result.get("ok")) and error is None
+    if not report["ok"]:
+        report["log_tail"] = log_tail(log_path)
+    return report
+
+
+def print_report(report):
+    """Print the outcome of one job"""
+    if report["ok"]:
+        print(f"{report['name']:30} ok      {report['wall_time']:8.2f} s  "
+              f"generate {report.get('generate_time', 0.0):7.2f} s  {report.get('line_count', 0):7} lines")
+    else:
+        print(f"{report['name']:30} FAILED  {report['wall_time']:8.2f} s  {report.get('error', '')}")
+
+
+def apply_properties(props, values):
+    """Set scene properties from plain JSON values"""
+    for key, value in values.items():
+        if not hasattr(props, key):
+            raise KeyError(f"unknown speed lines property {key!r}")
+        setattr(props, key, tuple(value) if isinstance(value, list) else value)
+
+
+def run_worker(job_path, result_path):
+    """Inside Blender: set up the scene for one job, generate and save it"""
+    import bpy
+    
+    sys.path.insert(0, ADDON_DIRECTORY)
+    import speedlines
+    
+    with open(job_path) as file:
+        job = json.load(file)
+    result = {"ok": False}
+    
+    try:
+        if not hasattr(bpy.types.Scene, "speedlines_props"):
+            speedlines.register()
+        scene = bpy.context.scene
+        props = scene.speedlines_props
+        
+        if job.get("frame_range"):
+            scene.frame_start, scene.frame_end = job["frame_range"]
+        if job.get("preset"):
+            bpy.ops.speedlines.speed_preset(preset_type=job["preset"])
+        if job.get("continuous_flow"):
+            bpy.ops.speedlines.continuous_flow()
+        apply_properties(props, job["props"])
+        props.replace_existing = True
+        
+        output_dir = job["output_dir"]
+        if job.get("bake"):
+            props.cache_directory = os.path.join(output_dir, "cache", "")
+            start = time.perf_counter()
+            if bpy.ops.speedlines.bake() != {'FINISHED'}:
+                raise RuntimeError("baking the line cache failed")
+            result["bake_time"] = time.perf_counter() - start
+            result["cache"] = speedlines.line_cache_path(props)
+            # Generate from the cache just baked instead of computing the lines again
+            props.use_line_cache = True
+        
+        start = time.perf_counter()
+        if bpy.ops.speedlines.generate() != {'FINISHED'}:
+            raise RuntimeError("generating the speed lines failed")
+        result["generate_time"] = time.perf_counter() - start
+        result["line_count"] = props.line_count
+        
+        if job.get("save", True):
+            path = os.path.join(output_dir, f"{job['name']}.blend")
+            start = time.perf_counter()
+            bpy.ops.wm.save_as_mainfile(filepath=path, copy=True)
+            result["save_time"] = time.perf_counter() - start
+            result["blend"] = path
+        result["ok"] = True
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        print(f"Speed lines batch job {job.get('name')} failed: {result['error']}")
+    
+    with open(result_path, "w") as file:
+        json.dump(result, file)
+    if not result["ok"]:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("job_file", help="JSON or TOML file with the jobs to run")
+    parser.add_argument("--output-dir", default="speedlines_batch", help="directory for blend files, caches and logs")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"),
+                        help="Blender executable, defaults to $BLENDER or blender on the PATH")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Blender processes to run at once")
+    parser.add_argument("--blender-threads", type=int, default=0,
+                        help="threads per Blender process, 0 lets Blender decide")
+    parser.add_argument("--worker-threads", type=int, default=1,
+                        help="line precompute threads per job unless its props set worker_threads")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds before a job is killed")
+    args = parser.parse_args()
+    
+    jobs = load_jobs(args.job_file)
+    if not jobs:
+        sys.exit(f"No jobs in {args.job_file}")
+    os.makedirs(os.path.join(args.output_dir, "logs"), exist_ok=True)
+    
+    start = time.perf_counter()
+    reports = []
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        for report in pool.map(lambda job: run_job(job, args), jobs):
+            print_report(report)
+            reports.append(report)
+    total = time.perf_counter() - start
+    
+    failed = [report["name"] for report in reports if not report["ok"]]
+    report_path = os.path.join(args.output_dir, "batch_report.json")
+    with open(report_path, "w") as file:
+        json.dump({"wall_time": total, "processes": args.jobs, "failed": failed, "jobs": reports}, file, indent=2)
+    
+    print(f"{len(reports) - len(failed)} of {len(reports)} jobs succeeded in {total:.1f} s, report in {report_path}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    if "--worker" in argv:
+        worker_args = argparse.ArgumentParser()
+        worker_args.add_argument("--worker", required=True)
+        worker_args.add_argument("--result", required=True)
+        parsed = worker_args.parse_args(argv)
+        run_worker(parsed.worker, parsed.result)
+    else:
+        main()